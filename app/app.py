@@ -1,3 +1,6 @@
+import os
+import html
+import time
 import streamlit as st
 import cv2
 import numpy as np
@@ -7,16 +10,94 @@ from emotion.webcam_emotion import WebcamEmotionDetector
 from recommender.music import SpotifyRecommender
 from recommender.movies import MovieRecommender
 from recommender.quotes import QuoteRecommender
+from recommender.prefetch import RecommendationPrefetcher
+from recommender.speculative import SpeculativePipeline
+from recommender.streaming import stream_recommendations
 from journal.journal import MoodJournal
+from utils.image_cache import RENDER_WAIT_SECONDS, ImageCache
+from utils.tracing import tracer, profile_from_env
 import plotly.graph_objects as go
 from datetime import datetime
 
+@st.cache_resource(show_spinner=False)
+def get_prefetcher() -> RecommendationPrefetcher:
+    """Create the recommendation prefetcher once per server and start warming it."""
+    prefetcher = RecommendationPrefetcher({
+        'music': SpotifyRecommender(),
+        'movies': MovieRecommender(),
+        'quotes': QuoteRecommender(use_fallback=False)
+    })
+    prefetcher.start()
+    return prefetcher
+
+@st.cache_resource(show_spinner=False)
+def get_pipeline() -> SpeculativePipeline:
+    """Create the speculative text pipeline once per server."""
+    return SpeculativePipeline(get_prefetcher(), TextEmotionDetector.estimate_emotion)
+
+@st.cache_resource(show_spinner=False)
+def get_image_cache() -> ImageCache:
+    """Create the poster/album art thumbnail cache once per server."""
+    return ImageCache()
+
+# Image field and display width for providers that have artwork
+IMAGE_FIELDS = {'music': ('album_image', 100), 'movies': ('poster_path', 200)}
+
+def speculate_on_input() -> None:
+    """Start fetching recommendations for a quick estimate as soon as the text changes."""
+    if st.session_state.mood_text:
+        pipeline.speculate(st.session_state.mood_text)
+
+def lazy_image(url: str, width: int) -> None:
+    """Render a remote image that the browser only loads once it scrolls into view."""
+    st.markdown(f'<img src="{html.escape(url)}" width="{width}" loading="lazy">', unsafe_allow_html=True)
+
+def cached_image(url: str, width: int) -> None:
+    """Render a thumbnail from the local image cache, falling back to the remote URL."""
+    # Only a short wait: this thread also drains the recommendation stream
+    data = image_cache.get_thumbnail(url, width, timeout=RENDER_WAIT_SECONDS)
+    if data:
+        st.image(data, width=width)
+    else:
+        lazy_image(url, width)
+
+def with_image_prefetch(name: str, items):
+    """Start caching each item's artwork as soon as the item arrives."""
+    field = IMAGE_FIELDS.get(name)
+    for item in items:
+        if field and item.get(field[0]):
+            image_cache.prefetch(item[field[0]], field[1])
+        yield item
+
+def render_song(song: dict) -> None:
+    st.write(f"**{song['name']}** by {song['artist']}")
+    if song['preview_url']:
+        st.audio(song['preview_url'])
+    if song['album_image']:
+        cached_image(song['album_image'], width=IMAGE_FIELDS['music'][1])
+    st.markdown(f"[Listen on Spotify]({song['external_url']})")
+
+def render_quote(quote: dict) -> None:
+    st.markdown(f"> {quote['content']}")
+    st.markdown(f"— *{quote['author']}*")
+
+def render_movie(movie: dict) -> None:
+    st.markdown(f"### {movie['title']} ({movie['release_date'][:4]})")
+    if movie['poster_path']:
+        cached_image(movie['poster_path'], width=IMAGE_FIELDS['movies'][1])
+    st.markdown(f"**Rating:** ⭐ {movie['rating']}/10")
+    st.markdown(f"**Runtime:** {movie['runtime']} minutes")
+    st.markdown(f"**Genres:** {', '.join(movie['genres'])}")
+    with st.expander("Overview"):
+        st.write(movie['overview'])
+    st.markdown(f"[View on TMDB]({movie['tmdb_url']})")
+
 # Initialize components
 text_detector = TextEmotionDetector()
 webcam_detector = WebcamEmotionDetector()
-music_recommender = SpotifyRecommender()
-movie_recommender = MovieRecommender()
-quote_recommender = QuoteRecommender()
+prefetcher = get_prefetcher()
+pipeline = get_pipeline()
+image_cache = get_image_cache()
 journal = MoodJournal()
 
 # Page config
@@ -37,21 +118,28 @@ and get personalized recommendations for music, movies, and inspirational quotes
 st.sidebar.title("Navigation")
 page = st.sidebar.radio("Go to", ["Mood Detection", "Journal & Analytics"])
 
+# Latency metrics (enabled with MOODBOARD_TRACING=1), filled in at the end of the run
+performance_panel = st.sidebar.empty() if tracer.enabled else None
+
 if page == "Mood Detection":
     # Input method selection
     input_method = st.radio("Choose input method:", ["Text", "Webcam"])
     
     detected_emotion = None
     confidence = None
+    resolved = None
     
     if input_method == "Text":
-        # Text input
-        text_input = st.text_area("How are you feeling? (Describe your mood)")
+        # Text input (speculative recommendation fetching starts when the text changes)
+        text_input = st.text_area("How are you feeling? (Describe your mood)", key="mood_text",
+                                  on_change=speculate_on_input)
         if text_input and st.button("Analyze"):
+            analysis_start = time.perf_counter()
             with st.spinner("Analyzing your mood..."):
-                result = text_detector.get_emotion(text_input)
-                detected_emotion = result['primary_emotion']
-                confidence = result['confidence']
+                # Profiled inside the pipeline: the classifier runs on its inference thread
+                resolved = pipeline.resolve(text_input, text_detector.get_emotion, profile_name='text_emotion')
+                detected_emotion = resolved['emotion']['primary_emotion']
+                confidence = resolved['emotion']['confidence']
                 
     else:
         # Webcam input
@@ -65,7 +153,8 @@ if page == "Mood Detection":
                 frame = cv2.imdecode(file_bytes, cv2.IMREAD_COLOR)
                 
                 # Process frame
-                with st.spinner("Analyzing your expression..."):
+                analysis_start = time.perf_counter()
+                with st.spinner("Analyzing your expression..."), profile_from_env('webcam_emotion'):
                     processed_frame, emotion_data = webcam_detector.process_webcam(frame)
                     if emotion_data:
                         detected_emotion = emotion_data['primary_emotion']
@@ -79,44 +168,59 @@ if page == "Mood Detection":
         # Create columns for recommendations
         col1, col2 = st.columns(2)
         
+        # Placeholders for each provider, filled in as items arrive
         with col1:
             st.success(f"Detected Emotion: {detected_emotion.title()} (Confidence: {confidence:.2f})")
+            timing_slot = st.empty()
             
-            # Music recommendations
             st.subheader("🎵 Music Recommendations")
-            with st.spinner("Getting music recommendations..."):
-                songs = music_recommender.get_recommendations(detected_emotion)
-                for song in songs:
-                    st.write(f"**{song['name']}** by {song['artist']}")
-                    if song['preview_url']:
-                        st.audio(song['preview_url'])
-                    if song['album_image']:
-                        st.image(song['album_image'], width=100)
-                    st.markdown(f"[Listen on Spotify]({song['external_url']})")
+            music_slots = [st.empty() for _ in range(5)]
             
-            # Quotes
             st.subheader("💭 Inspirational Quotes")
-            with st.spinner("Finding relevant quotes..."):
-                quotes = quote_recommender.get_recommendations(detected_emotion)
-                for quote in quotes:
-                    st.markdown(f"> {quote['content']}")
-                    st.markdown(f"— *{quote['author']}*")
+            quote_slots = [st.empty() for _ in range(3)]
         
         with col2:
-            # Movie recommendations
             st.subheader("🎬 Movie Recommendations")
-            with st.spinner("Getting movie recommendations..."):
-                movies = movie_recommender.get_recommendations(detected_emotion)
-                for movie in movies:
-                    st.markdown(f"### {movie['title']} ({movie['release_date'][:4]})")
-                    if movie['poster_path']:
-                        st.image(movie['poster_path'], width=200)
-                    st.markdown(f"**Rating:** ⭐ {movie['rating']}/10")
-                    st.markdown(f"**Runtime:** {movie['runtime']} minutes")
-                    st.markdown(f"**Genres:** {', '.join(movie['genres'])}")
-                    with st.expander("Overview"):
-                        st.write(movie['overview'])
-                    st.markdown(f"[View on TMDB]({movie['tmdb_url']})")
+            movie_slots = [st.empty() for _ in range(5)]
+        
+        slots = {'music': music_slots, 'quotes': quote_slots, 'movies': movie_slots}
+        renderers = {'music': render_song, 'quotes': render_quote, 'movies': render_movie}
+        for provider_slots in slots.values():
+            for slot in provider_slots:
+                slot.caption("⏳ Loading...")
+        
+        if resolved:
+            # Text input: results from the speculative pipeline
+            sources = {name: (lambda name=name, stream=stream: with_image_prefetch(name, stream))
+                       for name, stream in resolved['streams'].items()}
+        else:
+            sources = {name: (lambda name=name: with_image_prefetch(name, prefetcher.iter_recommendations(name, detected_emotion)))
+                       for name in slots}
+        
+        collected = {name: [] for name in slots}
+        first_item_seconds = None
+        for name, item in stream_recommendations(sources):
+            if item is None:
+                # Provider finished; clear any placeholders it didn't fill
+                for slot in slots[name][len(collected[name]):]:
+                    slot.empty()
+                continue
+            
+            index = len(collected[name])
+            collected[name].append(item)
+            if index < len(slots[name]):
+                with slots[name][index].container():
+                    renderers[name](item)
+            if first_item_seconds is None:
+                first_item_seconds = time.perf_counter() - analysis_start
+        
+        songs, movies, quotes = collected['music'], collected['movies'], collected['quotes']
+        if tracer.enabled and first_item_seconds is not None:
+            speculation = ""
+            if resolved:
+                outcome = 'skipped' if not resolved['speculated'] else 'hit' if resolved['speculation_hit'] else 'miss'
+                speculation = f" (speculation {outcome})"
+            timing_slot.caption(f"First recommendation shown after {first_item_seconds:.2f}s{speculation}")
         
         # Save to journal
         if st.button("Save to Journal"):
@@ -171,4 +275,24 @@ else:  # Journal & Analytics page
                     if 'movies' in entry['recommendations']:
                         st.write("🎬 Movies:", ", ".join(movie['title'] for movie in entry['recommendations']['movies'][:3]))
                     if 'quotes' in entry['recommendations']:
-                        st.write("💭 Quote:", entry['recommendations']['quotes'][0]['content']) 
\ No newline at end of file
+                        st.write("💭 Quote:", entry['recommendations']['quotes'][0]['content']) 
+
+# Latency metrics, including this run's spans
+if tracer.enabled:
+    with performance_panel.container(), st.expander("⏱️ Performance"):
+        for name, stats in tracer.summary().items():
+            st.write(f"`{name}`: {stats['count']} calls, {stats['mean_seconds'] * 1000:.1f} ms avg")
+        prefetch_metrics = prefetcher.metrics()
+        st.write(f"Prefetch: {prefetch_metrics['upstream_calls_saved']} upstream calls saved "
+                 f"({prefetch_metrics['hit_rate']:.0%} hit rate)")
+        image_metrics = image_cache.metrics()
+        st.write(f"Images: {image_metrics['hits']} cache hits, {image_metrics['misses']} misses, "
+                 f"{image_metrics['bytes_downloaded'] / 1024:.0f} KB downloaded")
+        if pipeline.hit_rate() is not None:
+            st.write(f"Speculation: {pipeline.hit_rate():.0%} of estimates matched the final emotion")
+        st.download_button("Prometheus metrics", tracer.export_prometheus() + prefetcher.export_prometheus(),
+                           file_name="metrics.txt")
+
+# Persist the trace for this run (open in chrome://tracing or ui.perfetto.dev)
+if tracer.enabled:
+    tracer.write_trace(os.getenv('MOODBOARD_TRACE_FILE', 'app/data/trace.json'))
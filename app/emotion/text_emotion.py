@@ -1,16 +1,19 @@
 from transformers import pipeline
 from textblob import TextBlob
 import numpy as np
+from utils.tracing import span, traced
 
 class TextEmotionDetector:
     def __init__(self):
         # Initialize the emotion classifier pipeline
-        self.classifier = pipeline(
-            "text-classification",
-            model="bhadresh-savani/distilbert-base-emotion",
-            top_k=None
-        )
+        with span('text_emotion.model_load'):
+            self.classifier = pipeline(
+                "text-classification",
+                model="bhadresh-savani/distilbert-base-emotion",
+                top_k=None
+            )
         
+    @traced('text_emotion.get_emotion')
     def get_emotion(self, text: str) -> dict:
         """
         Detect emotion from text using transformer model and TextBlob for sentiment.
@@ -21,12 +24,14 @@ class TextEmotionDetector:
         Returns:
             dict: Dictionary containing emotion and confidence scores
         """
-        # Get emotion classification
-        emotions = self.classifier(text)[0]
+        # Get emotion classification (tokenization + forward pass)
+        with span('text_emotion.classifier'):
+            emotions = self.classifier(text)[0]
         
         # Get sentiment using TextBlob
-        blob = TextBlob(text)
-        sentiment_score = blob.sentiment.polarity
+        with span('text_emotion.textblob'):
+            blob = TextBlob(text)
+            sentiment_score = blob.sentiment.polarity
         
         # Convert emotions to dictionary format
         emotion_scores = {item['label']: item['score'] for item in emotions}
@@ -41,6 +46,36 @@ class TextEmotionDetector:
             'all_emotions': emotion_scores
         }
     
+    @staticmethod
+    @traced('text_emotion.estimate_emotion')
+    def estimate_emotion(text: str) -> dict:
+        """
+        Cheap first-pass emotion estimate from TextBlob polarity alone.
+
+        Only separates happy / sad / neutral, but runs in well under a millisecond,
+        so it can drive speculative work while the transformer is still running.
+        The classifier has no neutral label, so 'neutral' means "don't speculate".
+        
+        Args:
+            text (str): Input text to analyze
+        
+        Returns:
+            dict: Dictionary containing the estimated emotion and sentiment score
+        """
+        sentiment_score = TextBlob(text).sentiment.polarity
+        
+        if sentiment_score >= 0.2:
+            primary_emotion = 'happy'
+        elif sentiment_score <= -0.2:
+            primary_emotion = 'sad'
+        else:
+            primary_emotion = 'neutral'
+        
+        return {
+            'primary_emotion': primary_emotion,
+            'sentiment_score': sentiment_score
+        }
+    
     def get_emotion_category(self, text: str) -> str:
         """
         Get just the primary emotion category for the text.
@@ -2,13 +2,16 @@ import cv2
 from fer import FER
 import numpy as np
 from typing import Optional, Dict, Any
+from utils.tracing import span, traced
 
 class WebcamEmotionDetector:
     def __init__(self):
         """Initialize the FER emotion detector and webcam."""
-        self.detector = FER(mtcnn=True)
+        with span('webcam_emotion.model_load'):
+            self.detector = FER(mtcnn=True)
         self.emotions = ['angry', 'disgust', 'fear', 'happy', 'sad', 'surprise', 'neutral']
         
+    @traced('webcam_emotion.get_emotion_from_frame')
     def get_emotion_from_frame(self, frame: np.ndarray) -> Optional[Dict[str, Any]]:
         """
         Detect emotion from a single frame.
@@ -23,7 +26,8 @@ class WebcamEmotionDetector:
         rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
         
         # Detect emotions
-        result = self.detector.detect_emotions(rgb_frame)
+        with span('webcam_emotion.detect_emotions'):
+            result = self.detector.detect_emotions(rgb_frame)
         
         if not result:  # No face detected
             return None
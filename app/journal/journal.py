@@ -5,6 +5,7 @@ from typing import Dict, List, Optional
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
+from utils.tracing import span, traced
 
 class MoodJournal:
     def __init__(self, journal_path: str = "app/data/mood_journal.json"):
@@ -24,6 +25,7 @@ class MoodJournal:
             with open(self.journal_path, 'w') as f:
                 json.dump([], f)
     
+    @traced('journal.add_entry')
     def add_entry(self, 
                   emotion: str,
                   confidence: float,
@@ -56,11 +58,13 @@ class MoodJournal:
         entries.append(entry)
         
         # Save updated entries
-        with open(self.journal_path, 'w') as f:
-            json.dump(entries, f, indent=2)
+        with span('journal.write'):
+            with open(self.journal_path, 'w') as f:
+                json.dump(entries, f, indent=2)
             
         return entry
     
+    @traced('journal.load_entries')
     def load_entries(self) -> List[Dict]:
         """
         Load all journal entries.
@@ -101,6 +105,7 @@ class MoodJournal:
             'timeline': timeline.to_dict() if not timeline.empty else None
         }
     
+    @traced('journal.create_visualization')
     def create_visualization(self) -> Dict:
         """
         Create visualizations of mood data.
@@ -1,6 +1,10 @@
 import os
+import threading
 import requests
-from typing import List, Dict
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Dict, Iterator, Optional
+from utils.tracing import span, traced
 
 class MovieRecommender:
     def __init__(self):
@@ -8,6 +12,10 @@ class MovieRecommender:
         self.api_key = os.getenv('TMDB_API_KEY')
         self.base_url = 'https://api.themoviedb.org/3'
         
+        # Next offset into the discover results per emotion, so repeated calls return different movies
+        self._offsets = Counter()
+        self._offsets_lock = threading.Lock()
+        
         # Emotion to genre/keyword mapping
         self.emotion_mapping = {
             'happy': {
@@ -40,6 +48,7 @@ class MovieRecommender:
             }
         }
     
+    @traced('recommender.movies.get_recommendations')
     def get_recommendations(self, emotion: str, limit: int = 5) -> List[Dict]:
         """
         Get movie recommendations based on emotion.
@@ -51,8 +60,26 @@ class MovieRecommender:
         Returns:
             List[Dict]: List of recommended movies
         """
+        return list(self.iter_recommendations(emotion, limit))
+    
+    def iter_recommendations(self, emotion: str, limit: int = 5) -> Iterator[Dict]:
+        """
+        Yield movie recommendations as their details arrive.
+        
+        Detail requests run in parallel, so movies are yielded in completion
+        order rather than popularity order. Successive calls for the same emotion
+        walk through the first page of popular movies limit at a time, so pooled
+        result sets differ.
+        
+        Args:
+            emotion (str): Detected emotion
+            limit (int): Number of recommendations to return
+            
+        Yields:
+            Dict: Recommended movie
+        """
         if not self.api_key:
-            return []
+            return
             
         emotion_data = self.emotion_mapping.get(emotion.lower(), self.emotion_mapping['neutral'])
         
@@ -64,36 +91,59 @@ class MovieRecommender:
             'page': 1
         }
         
-        response = requests.get(
-            f'{self.base_url}/discover/movie',
-            params=params
-        )
+        with span('recommender.movies.http.discover'):
+            response = requests.get(
+                f'{self.base_url}/discover/movie',
+                params=params
+            )
         
         if response.status_code != 200:
-            return []
+            return
             
-        movies = response.json().get('results', [])[:limit]
+        results = response.json().get('results', [])
+        if not results:
+            return
+        with self._offsets_lock:
+            offset = self._offsets[emotion.lower()]
+            self._offsets[emotion.lower()] += limit
+        start = offset % len(results)
+        movies = (results[start:] + results[:start])[:limit]
         
-        # Get additional details for each movie
-        detailed_movies = []
-        for movie in movies:
-            movie_id = movie['id']
+        # Get additional details for each movie in parallel
+        with ThreadPoolExecutor(max_workers=len(movies)) as executor:
+            futures = [executor.submit(self.get_movie_details, movie['id']) for movie in movies]
+            for future in as_completed(futures):
+                details = future.result()
+                if details:
+                    yield details
+    
+    def get_movie_details(self, movie_id: int) -> Optional[Dict]:
+        """
+        Get details for a single movie.
+        
+        Args:
+            movie_id (int): TMDB movie ID
+            
+        Returns:
+            Optional[Dict]: Movie details or None if the request failed
+        """
+        with span('recommender.movies.http.details'):
             details_response = requests.get(
                 f'{self.base_url}/movie/{movie_id}',
                 params={'api_key': self.api_key}
             )
+        
+        if details_response.status_code != 200:
+            return None
             
-            if details_response.status_code == 200:
-                details = details_response.json()
-                detailed_movies.append({
-                    'title': details['title'],
-                    'overview': details['overview'],
-                    'release_date': details['release_date'],
-                    'rating': details['vote_average'],
-                    'poster_path': f"https://image.tmdb.org/t/p/w500{details['poster_path']}" if details['poster_path'] else None,
-                    'genres': [genre['name'] for genre in details['genres']],
-                    'runtime': details['runtime'],
-                    'tmdb_url': f"https://www.themoviedb.org/movie/{movie_id}"
-                })
-                
-        return detailed_movies 
\ No newline at end of file
+        details = details_response.json()
+        return {
+            'title': details['title'],
+            'overview': details['overview'],
+            'release_date': details['release_date'],
+            'rating': details['vote_average'],
+            'poster_path': f"https://image.tmdb.org/t/p/w500{details['poster_path']}" if details['poster_path'] else None,
+            'genres': [genre['name'] for genre in details['genres']],
+            'runtime': details['runtime'],
+            'tmdb_url': f"https://www.themoviedb.org/movie/{movie_id}"
+        } 
\ No newline at end of file
@@ -1,16 +1,21 @@
 import os
 import base64
+import threading
 import requests
-from typing import List, Dict, Optional
+from typing import List, Dict, Iterator, Optional
 from datetime import datetime, timedelta
+from utils.tracing import span, traced
 
 class SpotifyRecommender:
     def __init__(self):
         """Initialize Spotify API client."""
         self.client_id = os.getenv('SPOTIFY_CLIENT_ID')
         self.client_secret = os.getenv('SPOTIFY_CLIENT_SECRET')
+        self.auth_url = 'https://accounts.spotify.com/api/token'
+        self.base_url = 'https://api.spotify.com/v1'
         self.token = None
         self.token_expiry = None
+        self._token_lock = threading.Lock()
         
         # Emotion to music mapping
         self.emotion_genres = {
@@ -24,25 +29,29 @@ class SpotifyRecommender:
         }
         
     def get_token(self) -> None:
-        """Get or refresh Spotify API access token."""
-        if self.token and self.token_expiry > datetime.now():
-            return
+        """Get or refresh Spotify API access token (safe to call from several threads)."""
+        # Held across the request so concurrent callers share a single token fetch
+        with self._token_lock:
+            if self.token and self.token_expiry > datetime.now():
+                return
+                
+            auth = base64.b64encode(
+                f"{self.client_id}:{self.client_secret}".encode()
+            ).decode()
             
-        auth = base64.b64encode(
-            f"{self.client_id}:{self.client_secret}".encode()
-        ).decode()
-        
-        response = requests.post(
-            'https://accounts.spotify.com/api/token',
-            headers={'Authorization': f'Basic {auth}'},
-            data={'grant_type': 'client_credentials'}
-        )
-        
-        if response.status_code == 200:
-            data = response.json()
-            self.token = data['access_token']
-            self.token_expiry = datetime.now() + timedelta(seconds=data['expires_in'])
+            with span('recommender.music.http.token'):
+                response = requests.post(
+                    self.auth_url,
+                    headers={'Authorization': f'Basic {auth}'},
+                    data={'grant_type': 'client_credentials'}
+                )
+            
+            if response.status_code == 200:
+                data = response.json()
+                self.token_expiry = datetime.now() + timedelta(seconds=data['expires_in'])
+                self.token = data['access_token']
     
+    @traced('recommender.music.get_recommendations')
     def get_recommendations(self, emotion: str, limit: int = 5) -> List[Dict]:
         """
         Get music recommendations based on emotion.
@@ -54,10 +63,23 @@ class SpotifyRecommender:
         Returns:
             List[Dict]: List of recommended tracks
         """
+        return list(self.iter_recommendations(emotion, limit))
+    
+    def iter_recommendations(self, emotion: str, limit: int = 5) -> Iterator[Dict]:
+        """
+        Yield music recommendations one track at a time.
+        
+        Args:
+            emotion (str): Detected emotion
+            limit (int): Number of recommendations to return
+            
+        Yields:
+            Dict: Recommended track
+        """
         self.get_token()
         
         if not self.token:
-            return []
+            return
             
         # Get genres for the emotion
         seed_genres = self.emotion_genres.get(emotion.lower(), ['pop'])
@@ -88,21 +110,23 @@ class SpotifyRecommender:
                 'min_tempo': 130
             })
             
-        response = requests.get(
-            'https://api.spotify.com/v1/recommendations',
-            headers={'Authorization': f'Bearer {self.token}'},
-            params=params
-        )
+        with span('recommender.music.http.recommendations'):
+            response = requests.get(
+                f'{self.base_url}/recommendations',
+                headers={'Authorization': f'Bearer {self.token}'},
+                params=params
+            )
         
         if response.status_code != 200:
-            return []
+            return
             
         tracks = response.json().get('tracks', [])
         
-        return [{
-            'name': track['name'],
-            'artist': track['artists'][0]['name'],
-            'preview_url': track['preview_url'],
-            'external_url': track['external_urls']['spotify'],
-            'album_image': track['album']['images'][0]['url'] if track['album']['images'] else None
-        } for track in tracks] 
\ No newline at end of file
+        for track in tracks:
+            yield {
+                'name': track['name'],
+                'artist': track['artists'][0]['name'],
+                'preview_url': track['preview_url'],
+                'external_url': track['external_urls']['spotify'],
+                'album_image': track['album']['images'][0]['url'] if track['album']['images'] else None
+            } 
\ No newline at end of file
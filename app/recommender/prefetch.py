@@ -0,0 +1,292 @@
+import time
+import threading
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
+from utils.tracing import span, traced
+
+# Emotion categories shared by the recommenders' mappings
+EMOTIONS = ('happy', 'sad', 'angry', 'fear', 'surprise', 'disgust', 'neutral')
+
+
+class RecommendationPrefetcher:
+    def __init__(self,
+                 recommenders: Dict[str, object],
+                 emotions: Tuple[str, ...] = EMOTIONS,
+                 pool_size: int = 3,
+                 refresh_interval: float = 900.0,
+                 max_workers: int = 4):
+        """
+        Initialize the prefetcher.
+
+        Keeps a rotating pool of recent result sets for every (recommender, emotion)
+        pair so requests are served without waiting on the upstream APIs.
+        Recommenders should raise on upstream failures rather than return canned
+        results (e.g. QuoteRecommender(use_fallback=False)); their get_fallback(),
+        if any, is then served without being pooled.
+
+        Args:
+            recommenders (Dict[str, object]): Recommenders keyed by name, e.g. {'music': SpotifyRecommender()}
+            emotions (Tuple[str, ...]): Emotions to warm on startup
+            pool_size (int): Result sets kept per pool; the oldest is dropped when a new one arrives
+            refresh_interval (float): Seconds between background refreshes
+            max_workers (int): Concurrent upstream fetches while warming
+        """
+        self.recommenders = recommenders
+        self.emotions = emotions
+        self.pool_size = pool_size
+        self.refresh_interval = refresh_interval
+        self.max_workers = max_workers
+
+        self.pools: Dict[Tuple[str, str], deque] = {}
+        self.stats = Counter()
+        self._cursors: Counter = Counter()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _fetch(self, name: str, emotion: str) -> List[Dict]:
+        """
+        Fetch one result set from upstream and add it to its pool.
+
+        Args:
+            name (str): Recommender name
+            emotion (str): Emotion, lower-cased
+
+        Returns:
+            List[Dict]: Fetched recommendations (the recommender's fallback, or empty, on failure)
+        """
+        with self._lock:
+            self.stats['upstream_calls'] += 1
+
+        try:
+            results = self.recommenders[name].get_recommendations(emotion)
+        except Exception:
+            return self._fallback(name, emotion)
+
+        self._add_to_pool(name, emotion, results)
+        return results
+
+    def _fallback(self, name: str, emotion: str) -> List[Dict]:
+        """
+        Count an upstream error and get the recommender's built-in results, if it has any.
+
+        Fallback results are served but never pooled, so the next request retries upstream.
+        """
+        with self._lock:
+            self.stats['upstream_errors'] += 1
+        get_fallback = getattr(self.recommenders[name], 'get_fallback', None)
+        return list(get_fallback(emotion)) if get_fallback else []
+
+    def _add_to_pool(self, name: str, emotion: str, results: List[Dict]) -> None:
+        # Empty results usually mean a missing API key or a failed request; don't pool them
+        if not results:
+            return
+        with self._lock:
+            pool = self.pools.get((name, emotion))
+            if pool is None:
+                pool = self.pools[(name, emotion)] = deque(maxlen=self.pool_size)
+            pool.append({'results': results, 'fetched_at': time.time()})
+
+    def _take_from_pool(self, key: Tuple[str, str]) -> Optional[List[Dict]]:
+        """Next pooled result set for key (rotating), or None on a miss. Updates hit/miss counters."""
+        with self._lock:
+            pool = self.pools.get(key)
+            if pool:
+                index = self._cursors[key] % len(pool)
+                self._cursors[key] += 1
+                self.stats['pool_hits'] += 1
+                return list(pool[index]['results'])
+            self.stats['pool_misses'] += 1
+            return None
+
+    def peek(self, name: str, emotion: str) -> Optional[List[Dict]]:
+        """
+        Get the result set the next lookup would return, without counting it or advancing the rotation.
+
+        For speculative lookups that may be thrown away; call record_lookup() once
+        the results are actually served.
+
+        Args:
+            name (str): Recommender name
+            emotion (str): Emotion
+
+        Returns:
+            Optional[List[Dict]]: Pooled recommendations, or None if the pool is empty
+        """
+        key = (name, emotion.lower())
+        with self._lock:
+            pool = self.pools.get(key)
+            if not pool:
+                return None
+            return list(pool[self._cursors[key] % len(pool)]['results'])
+
+    def record_lookup(self, name: str, emotion: str, hit: bool) -> None:
+        """
+        Count a served lookup made with peek() and use_pool=False.
+
+        Args:
+            name (str): Recommender name
+            emotion (str): Emotion
+            hit (bool): Whether the served results came from the pool; hits advance the rotation
+        """
+        key = (name, emotion.lower())
+        with self._lock:
+            if hit:
+                self._cursors[key] += 1
+                self.stats['pool_hits'] += 1
+            else:
+                self.stats['pool_misses'] += 1
+
+    def warm(self) -> None:
+        """Fill every pool up to pool_size result sets."""
+        jobs = []
+        for name in self.recommenders:
+            for emotion in self.emotions:
+                with self._lock:
+                    pool = self.pools.get((name, emotion))
+                    missing = self.pool_size - (len(pool) if pool else 0)
+                jobs.extend([(name, emotion)] * missing)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            list(executor.map(lambda job: self._fetch(*job), jobs))
+
+    def refresh(self) -> None:
+        """Replace the oldest result set in every known pool with a fresh one."""
+        with self._lock:
+            keys = set(self.pools)
+        keys.update((name, emotion) for name in self.recommenders for emotion in self.emotions)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            list(executor.map(lambda key: self._fetch(*key), sorted(keys)))
+
+    def _run(self) -> None:
+        self.warm()
+        while not self._stop.wait(self.refresh_interval):
+            self.refresh()
+
+    def start(self) -> None:
+        """Warm all pools and refresh them every refresh_interval seconds in a daemon thread."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background refresh thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    @traced('recommender.prefetch.get_recommendations')
+    def get_recommendations(self, name: str, emotion: str) -> List[Dict]:
+        """
+        Get recommendations, from the pool when possible.
+
+        Successive calls for the same emotion rotate through the pooled result sets.
+        On a miss the recommender is called directly and the result is pooled.
+
+        Args:
+            name (str): Recommender name
+            emotion (str): Detected emotion
+
+        Returns:
+            List[Dict]: Recommendations
+        """
+        key = (name, emotion.lower())
+        results = self._take_from_pool(key)
+        if results is not None:
+            return results
+        return list(self._fetch(*key))
+
+    def iter_recommendations(self, name: str, emotion: str, use_pool: bool = True) -> Iterator[Dict]:
+        """
+        Yield recommendations one at a time, from the pool when possible.
+
+        On a miss, items are streamed from the recommender's iter_recommendations
+        as they arrive and the complete set is pooled afterwards.
+
+        Args:
+            name (str): Recommender name
+            emotion (str): Detected emotion
+            use_pool (bool): If False, skip the pool lookup and its hit/miss counters
+                and always go upstream (the results are still pooled)
+
+        Yields:
+            Dict: Recommendation
+        """
+        key = (name, emotion.lower())
+        results = self._take_from_pool(key) if use_pool else None
+        if results is not None:
+            yield from results
+            return
+
+        recommender = self.recommenders[name]
+        if not hasattr(recommender, 'iter_recommendations'):
+            yield from self._fetch(*key)
+            return
+
+        with self._lock:
+            self.stats['upstream_calls'] += 1
+        results = []
+        try:
+            with span(f'recommender.{name}.iter_recommendations'):
+                for item in recommender.iter_recommendations(key[1]):
+                    results.append(item)
+                    yield item
+        except Exception:
+            fallback = self._fallback(*key)
+            if not results:
+                yield from fallback
+            return
+        self._add_to_pool(*key, results)
+
+    def metrics(self) -> Dict:
+        """
+        Get pool freshness and upstream call statistics.
+
+        Returns:
+            Dict: Counters ('upstream_calls_saved' equals pool hits) and
+                per-pool size and oldest/newest result age in seconds
+        """
+        now = time.time()
+        with self._lock:
+            pools = {
+                f'{name}:{emotion}': {
+                    'size': len(pool),
+                    'oldest_age_seconds': now - pool[0]['fetched_at'],
+                    'newest_age_seconds': now - pool[-1]['fetched_at']
+                }
+                for (name, emotion), pool in sorted(self.pools.items()) if pool
+            }
+            counters = {key: self.stats[key] for key in ('upstream_calls', 'upstream_errors', 'pool_hits', 'pool_misses')}
+
+        counters['upstream_calls_saved'] = counters['pool_hits']
+        requests = counters['pool_hits'] + counters['pool_misses']
+        counters['hit_rate'] = counters['pool_hits'] / requests if requests else 0.0
+        return {**counters, 'pools': pools}
+
+    def export_prometheus(self, prefix: str = 'moodboard_prefetch') -> str:
+        """
+        Render metrics in the Prometheus text exposition format.
+
+        Args:
+            prefix (str): Metric name prefix
+
+        Returns:
+            str: Exposition text
+        """
+        metrics = self.metrics()
+        lines = []
+        for key in ('upstream_calls', 'upstream_errors', 'pool_hits', 'pool_misses', 'upstream_calls_saved'):
+            lines.append(f'# TYPE {prefix}_{key}_total counter')
+            lines.append(f'{prefix}_{key}_total {metrics[key]}')
+
+        for key in ('size', 'oldest_age_seconds', 'newest_age_seconds'):
+            lines.append(f'# TYPE {prefix}_pool_{key} gauge')
+            for pool_name, pool in metrics['pools'].items():
+                name, emotion = pool_name.split(':', 1)
+                lines.append(f'{prefix}_pool_{key}{{recommender="{name}",emotion="{emotion}"}} {pool[key]}')
+        return '\n'.join(lines) + '\n'
@@ -1,11 +1,19 @@
 import requests
-from typing import List, Dict
+from typing import List, Dict, Iterator
 import random
+from utils.tracing import span, traced
 
 class QuoteRecommender:
-    def __init__(self):
-        """Initialize quote recommender with emotion-tag mappings."""
+    def __init__(self, use_fallback: bool = True):
+        """
+        Initialize quote recommender with emotion-tag mappings.
+        
+        Args:
+            use_fallback (bool): Return built-in quotes when the API fails; if False,
+                API failures raise requests.RequestException instead
+        """
         self.base_url = "https://api.quotable.io"
+        self.use_fallback = use_fallback
         
         # Map emotions to relevant tags
         self.emotion_tags = {
@@ -18,6 +26,7 @@ class QuoteRecommender:
             'neutral': ['wisdom', 'life', 'philosophy']
         }
     
+    @traced('recommender.quotes.get_recommendations')
     def get_recommendations(self, emotion: str, limit: int = 3) -> List[Dict]:
         """
         Get quotes based on emotion.
@@ -29,6 +38,19 @@ class QuoteRecommender:
         Returns:
             List[Dict]: List of quotes with author and tags
         """
+        return list(self.iter_recommendations(emotion, limit))
+    
+    def iter_recommendations(self, emotion: str, limit: int = 3) -> Iterator[Dict]:
+        """
+        Yield quotes based on emotion one at a time.
+        
+        Args:
+            emotion (str): Detected emotion
+            limit (int): Number of quotes to return
+            
+        Yields:
+            Dict: Quote with author and tags
+        """
         # Get relevant tags for the emotion
         tags = self.emotion_tags.get(emotion.lower(), self.emotion_tags['neutral'])
         
@@ -42,23 +64,36 @@ class QuoteRecommender:
         }
         
         try:
-            response = requests.get(
-                f"{self.base_url}/quotes/random",
-                params=params
-            )
-            
-            if response.status_code == 200:
-                quotes = response.json()
-                return [{
-                    'content': quote['content'],
-                    'author': quote['author'],
-                    'tags': quote['tags']
-                } for quote in quotes]
-            
+            with span('recommender.quotes.http.random'):
+                response = requests.get(
+                    f"{self.base_url}/quotes/random",
+                    params=params
+                )
+            if response.status_code != 200:
+                raise requests.HTTPError(f"Quote API returned {response.status_code}", response=response)
         except requests.RequestException:
-            pass
+            if not self.use_fallback:
+                raise
+            yield from self.get_fallback(emotion)
+            return
+        
+        for quote in response.json():
+            yield {
+                'content': quote['content'],
+                'author': quote['author'],
+                'tags': quote['tags']
+            }
+    
+    def get_fallback(self, emotion: str) -> List[Dict]:
+        """
+        Get built-in quotes for when the API is unavailable.
+        
+        Args:
+            emotion (str): Detected emotion
             
-        # Fallback quotes if API fails
+        Returns:
+            List[Dict]: List of quotes with author and tags
+        """
         fallback_quotes = {
             'happy': [
                 {'content': 'Happiness is not something ready made. It comes from your own actions.',
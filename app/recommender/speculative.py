@@ -0,0 +1,224 @@
+import time
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional, Tuple
+from recommender.streaming import RecommendationBuffer
+from utils.tracing import profile_from_env, span
+
+# Text model labels that map onto the recommenders' emotion categories
+EMOTION_ALIASES = {
+    'joy': 'happy',
+    'love': 'happy',
+    'sadness': 'sad',
+    'anger': 'angry'
+}
+
+
+def normalize_emotion(emotion: str) -> str:
+    """Map a detector label onto the emotion categories the recommenders use."""
+    emotion = emotion.lower()
+    return EMOTION_ALIASES.get(emotion, emotion)
+
+
+class SpeculativePipeline:
+    def __init__(self,
+                 prefetcher,
+                 estimator: Callable[[str], Dict],
+                 providers: Tuple[str, ...] = ('music', 'movies', 'quotes'),
+                 max_workers: int = 6,
+                 inference_workers: int = 1,
+                 max_speculations: int = 8,
+                 skip_estimates: Tuple[str, ...] = ('neutral',)):
+        """
+        Initialize the speculative recommendation pipeline.
+
+        A cheap first-pass estimate starts fetching recommendations while the full
+        classifier is still running; the results are kept if the final label agrees.
+
+        Args:
+            prefetcher (RecommendationPrefetcher): Source of recommendations; needs peek(),
+                iter_recommendations(use_pool=False) and record_lookup()
+            estimator (Callable[[str], Dict]): Fast estimate returning {'primary_emotion': ...},
+                e.g. TextEmotionDetector.estimate_emotion
+            providers (Tuple[str, ...]): Recommender names to fetch
+            max_workers (int): Threads for provider fetches
+            inference_workers (int): Threads for the classifier, kept apart from the
+                fetch pool so inference never queues behind HTTP calls
+            max_speculations (int): Recent texts whose speculative results are kept
+            skip_estimates (Tuple[str, ...]): Estimates not worth speculating on, e.g.
+                'neutral', which the text classifier never returns
+        """
+        self.prefetcher = prefetcher
+        self.estimator = estimator
+        self.providers = providers
+        self.max_speculations = max_speculations
+        self.skip_estimates = skip_estimates
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        self.inference_executor = ThreadPoolExecutor(max_workers=inference_workers)
+        self.stats = {'hits': 0, 'misses': 0, 'skipped': 0}
+        self._speculations: 'OrderedDict[str, Dict]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _fetch_all(self, emotion: str) -> Dict:
+        """
+        Start streaming every provider for an emotion in parallel.
+
+        Items are buffered as they arrive, so they can be replayed once the final
+        label confirms the speculation. Pooled results are peeked rather than taken,
+        so a speculation that turns out wrong doesn't count as prefetch hits;
+        resolve() records the lookups once the results are served.
+
+        Returns:
+            Dict: {'emotion', 'started', 'streams', 'from_pool'}, with one
+                RecommendationBuffer per provider
+        """
+        def fetch(name, buffer):
+            with span(f'pipeline.fetch.{name}'):
+                buffer.fill(self.prefetcher.iter_recommendations(name, emotion, use_pool=False))
+
+        streams, from_pool = {}, {}
+        for name in self.providers:
+            pooled = self.prefetcher.peek(name, emotion)
+            from_pool[name] = pooled is not None
+            if pooled is None:
+                streams[name] = RecommendationBuffer()
+                self.executor.submit(fetch, name, streams[name])
+            else:
+                streams[name] = RecommendationBuffer(pooled)
+
+        return {
+            'emotion': emotion,
+            'started': time.perf_counter(),
+            'streams': streams,
+            'from_pool': from_pool
+        }
+
+    def speculate(self, text: str) -> Dict:
+        """
+        Estimate the emotion of (possibly unfinished) text and start fetching for it.
+
+        Safe to call on every edit; repeated calls for the same text reuse the
+        in-flight speculation. Nothing is fetched if the estimate is in skip_estimates.
+
+        Args:
+            text (str): Current input text
+
+        Returns:
+            Dict: The speculation record; 'emotion' is None if speculation was skipped
+        """
+        with self._lock:
+            speculation = self._speculations.get(text)
+            if speculation is not None:
+                self._speculations.move_to_end(text)
+                return speculation
+
+        with span('pipeline.estimate'):
+            estimate = normalize_emotion(self.estimator(text)['primary_emotion'])
+        if estimate in self.skip_estimates:
+            speculation = {'emotion': None, 'started': time.perf_counter(), 'streams': {}, 'from_pool': {}}
+        else:
+            speculation = self._fetch_all(estimate)
+
+        with self._lock:
+            self._speculations[text] = speculation
+            while len(self._speculations) > self.max_speculations:
+                self._speculations.popitem(last=False)
+        return speculation
+
+    def resolve(self, text: str, classify: Callable[[str], Dict], profile_name: Optional[str] = None) -> Dict:
+        """
+        Classify text and reconcile it with the speculative fetches, without waiting on them.
+
+        Args:
+            text (str): Input text
+            classify (Callable[[str], Dict]): Full classifier, e.g. TextEmotionDetector.get_emotion
+            profile_name (str, optional): Profile the classifier with profile_from_env under
+                this name; profiling happens on the inference thread, where it runs
+
+        Returns:
+            Dict: 'emotion' (classifier result), 'category', 'speculated',
+                'speculation_hit', 'inference_done' (perf_counter time) and 'streams',
+                a RecommendationBuffer per provider that yields items as they arrive
+        """
+        def infer():
+            if profile_name is None:
+                return classify(text)
+            with profile_from_env(profile_name):
+                return classify(text)
+
+        with span('pipeline.resolve'):
+            inference = self.inference_executor.submit(infer)
+            speculation = self.speculate(text)
+
+            result = inference.result()
+            inference_done = time.perf_counter()
+            category = normalize_emotion(result['primary_emotion'])
+
+            speculated = speculation['emotion'] is not None
+            hit = speculated and speculation['emotion'] == category
+            if not hit:
+                speculation = self._fetch_all(category)
+
+        with self._lock:
+            self.stats['hits' if hit else 'misses' if speculated else 'skipped'] += 1
+        for name, pooled in speculation['from_pool'].items():
+            self.prefetcher.record_lookup(name, category, pooled)
+
+        return {
+            'emotion': result,
+            'category': category,
+            'speculated': speculated,
+            'speculation_hit': hit,
+            'inference_done': inference_done,
+            'streams': speculation['streams']
+        }
+
+    def analyze(self, text: str, classify: Callable[[str], Dict], profile_name: Optional[str] = None) -> Dict:
+        """
+        Classify text and return recommendations for the final label.
+
+        Inference runs in parallel with speculative fetches for the estimated
+        emotion. If the final label agrees with the estimate the speculative
+        results are used; otherwise recommendations are fetched for the final label.
+
+        Args:
+            text (str): Input text
+            classify (Callable[[str], Dict]): Full classifier, e.g. TextEmotionDetector.get_emotion
+            profile_name (str, optional): Profile the classifier under this name, see resolve()
+
+        Returns:
+            Dict: 'emotion' (classifier result), 'category', 'recommendations',
+                'speculation_hit', 'inference_seconds', 'time_to_first_recommendation'
+                and 'total_seconds'
+        """
+        start = time.perf_counter()
+        with span('pipeline.analyze'):
+            resolved = self.resolve(text, classify, profile_name)
+
+            recommendations = {}
+            first_ready = None
+            for name, stream in resolved['streams'].items():
+                recommendations[name] = stream.result()
+                ready = stream.first_at if stream.first_at is not None else stream.done_at
+                first_ready = ready if first_ready is None else min(first_ready, ready)
+
+        end = time.perf_counter()
+        inference_done = resolved['inference_done']
+        # Nothing can be shown before the final label is known
+        first_recommendation = max(first_ready, inference_done) if first_ready is not None else end
+        return {
+            'emotion': resolved['emotion'],
+            'category': resolved['category'],
+            'recommendations': recommendations,
+            'speculation_hit': resolved['speculation_hit'],
+            'inference_seconds': inference_done - start,
+            'time_to_first_recommendation': first_recommendation - start,
+            'total_seconds': end - start
+        }
+
+    def hit_rate(self) -> Optional[float]:
+        """Share of speculated analyses whose final label matched the estimate."""
+        with self._lock:
+            total = self.stats['hits'] + self.stats['misses']
+            return self.stats['hits'] / total if total else None
@@ -0,0 +1,116 @@
+import time
+import queue
+import threading
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from utils.tracing import span, tracer
+
+# Marks the end of a provider's stream
+_DONE = object()
+
+
+class RecommendationBuffer:
+    def __init__(self, items: Optional[Iterable[Dict]] = None):
+        """
+        Initialize a buffer for one provider's stream that can be replayed by any number of readers.
+
+        Readers get every item received so far, then wait for new ones until the
+        buffer is closed.
+
+        Args:
+            items (Iterable[Dict], optional): Items already available; the buffer starts closed
+        """
+        self.items: List[Dict] = []
+        self.first_at: Optional[float] = None
+        self.done_at: Optional[float] = None
+        self.error: Optional[BaseException] = None
+        self._condition = threading.Condition()
+        if items is not None:
+            for item in items:
+                self.append(item)
+            self.close()
+
+    def append(self, item: Dict) -> None:
+        with self._condition:
+            if self.first_at is None:
+                self.first_at = time.perf_counter()
+            self.items.append(item)
+            self._condition.notify_all()
+
+    def close(self, error: Optional[BaseException] = None) -> None:
+        with self._condition:
+            self.error = error
+            self.done_at = time.perf_counter()
+            self._condition.notify_all()
+
+    def fill(self, source: Iterable[Dict]) -> None:
+        """Append every item of source, then close the buffer, recording any failure."""
+        try:
+            for item in source:
+                self.append(item)
+        except Exception as e:
+            self.close(e)
+        else:
+            self.close()
+
+    def result(self) -> List[Dict]:
+        """Wait for the stream to finish and get all of its items."""
+        with self._condition:
+            self._condition.wait_for(lambda: self.done_at is not None)
+            return list(self.items)
+
+    def __iter__(self) -> Iterator[Dict]:
+        index = 0
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: index < len(self.items) or self.done_at is not None)
+                if index >= len(self.items):
+                    if self.error is not None:
+                        raise self.error
+                    return
+                item = self.items[index]
+            index += 1
+            yield item
+
+
+def stream_recommendations(sources: Dict[str, Callable[[], Iterable[Dict]]]) -> Iterator[Tuple[str, Optional[Dict]]]:
+    """
+    Merge several recommendation streams, yielding items as soon as any provider produces one.
+
+    Each source runs in its own daemon thread, so a slow provider never holds back
+    a fast one. A provider that raises ends its stream early; the failure is
+    recorded as a 'stream.<provider>.error' span when tracing is enabled.
+
+    Args:
+        sources (Dict[str, Callable[[], Iterable[Dict]]]): Provider name to a callable
+            returning an iterable of items, e.g.
+            {'music': lambda: prefetcher.iter_recommendations('music', 'happy')}
+
+    Yields:
+        Tuple[str, Optional[Dict]]: (provider, item) for each item, then (provider, None)
+            once that provider is finished
+    """
+    items = queue.Queue()
+
+    def pump(name: str, source: Callable[[], Iterable[Dict]]) -> None:
+        start = time.perf_counter()
+        try:
+            with span(f'stream.{name}'):
+                for item in source():
+                    items.put((name, item))
+        except Exception:
+            if tracer.enabled:
+                tracer.record(f'stream.{name}.error', start, time.perf_counter() - start)
+        finally:
+            items.put((name, _DONE))
+
+    for name, source in sources.items():
+        threading.Thread(target=pump, args=(name, source), daemon=True).start()
+
+    remaining = len(sources)
+    while remaining:
+        name, item = items.get()
+        if item is _DONE:
+            remaining -= 1
+            yield name, None
+        else:
+            yield name, item
@@ -0,0 +1,310 @@
+import io
+import os
+import json
+import hashlib
+import threading
+from collections import Counter, OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError
+from typing import Dict, Optional, Tuple
+import requests
+from PIL import Image
+from utils.tracing import span, traced
+
+# How long the UI waits for a thumbnail download before showing the remote image instead
+RENDER_WAIT_SECONDS = 0.15
+
+
+class ImageCache:
+    def __init__(self,
+                 cache_dir: str = "app/data/image_cache",
+                 max_bytes: int = 100 * 1024 * 1024,
+                 max_workers: int = 4,
+                 timeout: float = 10.0):
+        """
+        Initialize the on-disk thumbnail cache.
+
+        Each remote image is downloaded once, resized, and stored under the SHA-256
+        of its original bytes, so the same image behind different URLs is stored
+        once. Least recently used thumbnails are evicted when the cache grows
+        past max_bytes.
+
+        Args:
+            cache_dir (str): Directory for thumbnails and the URL index
+            max_bytes (int): Maximum total size of stored thumbnails
+            max_workers (int): Threads used to download, decode and resize
+            timeout (float): Per-request download timeout in seconds
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self.index_path = os.path.join(cache_dir, "index.json")
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        self.stats = Counter()
+
+        self._lock = threading.Lock()
+        self._index_lock = threading.Lock()
+        self._pending: Dict[Tuple[str, int], Future] = {}
+        os.makedirs(cache_dir, exist_ok=True)
+        self._entries, self._total_bytes = self._scan()
+        self._stored = Counter(self._hash_of(name) for name in self._entries)
+        # Only index URLs whose image still has a thumbnail on disk
+        self._urls: Dict[str, set] = {}
+        self._index = {}
+        for url, content_hash in self._load_index().items():
+            if content_hash in self._stored:
+                self._add_url(url, content_hash)
+
+    def _load_index(self) -> Dict[str, str]:
+        """Load the URL -> content hash index."""
+        try:
+            with open(self.index_path, 'r') as f:
+                return json.load(f)
+        except (json.JSONDecodeError, FileNotFoundError):
+            return {}
+
+    def _save_index(self) -> None:
+        """Persist a snapshot of the index without holding the cache lock during the write."""
+        with self._index_lock:
+            with self._lock:
+                index = dict(self._index)
+            tmp_path = self.index_path + '.tmp'
+            with open(tmp_path, 'w') as f:
+                json.dump(index, f)
+            os.replace(tmp_path, self.index_path)
+
+    def _add_url(self, url: str, content_hash: str) -> None:
+        previous = self._index.get(url)
+        if previous is not None and previous != content_hash:
+            self._urls[previous].discard(url)
+        self._index[url] = content_hash
+        self._urls.setdefault(content_hash, set()).add(url)
+
+    def _scan(self) -> Tuple['OrderedDict[str, int]', int]:
+        """
+        Build the LRU order from thumbnails already on disk.
+
+        Returns:
+            Tuple[OrderedDict[str, int], int]: File name -> size, least recently used first,
+                and the total size
+        """
+        files = []
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(('.jpg', '.png')):
+                stat = os.stat(os.path.join(self.cache_dir, name))
+                files.append((stat.st_mtime, name, stat.st_size))
+        entries = OrderedDict((name, size) for _, name, size in sorted(files))
+        return entries, sum(entries.values())
+
+    @staticmethod
+    def _thumbnail_name(content_hash: str, width: int, extension: str) -> str:
+        return f"{content_hash}_w{width}.{extension}"
+
+    @staticmethod
+    def _hash_of(name: str) -> str:
+        return name.rsplit('_w', 1)[0]
+
+    def _lookup(self, url: str, width: int) -> Optional[str]:
+        """Find a stored thumbnail for url at width, marking it recently used."""
+        with self._lock:
+            content_hash = self._index.get(url)
+            if content_hash is None:
+                return None
+            for extension in ('jpg', 'png'):
+                name = self._thumbnail_name(content_hash, width, extension)
+                if name in self._entries:
+                    self._entries.move_to_end(name)
+                    break
+            else:
+                return None
+
+        path = os.path.join(self.cache_dir, name)
+        try:
+            os.utime(path)  # Persist recency for the next startup scan
+        except FileNotFoundError:
+            return None
+        return path
+
+    @staticmethod
+    def resize(data: bytes, width: int) -> Tuple[bytes, str]:
+        """
+        Decode an image and shrink it to at most width pixels wide.
+
+        Args:
+            data (bytes): Encoded source image
+            width (int): Target width in pixels
+
+        Returns:
+            Tuple[bytes, str]: Encoded thumbnail and its file extension
+        """
+        with Image.open(io.BytesIO(data)) as image:
+            image.draft('RGB', (width, width * 4))  # Lets JPEG decode at reduced scale
+            if image.width > width:
+                image = image.resize((width, max(1, round(image.height * width / image.width))), Image.LANCZOS)
+
+            output = io.BytesIO()
+            has_alpha = image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info)
+            if has_alpha:
+                image.save(output, format='PNG', optimize=True)
+                return output.getvalue(), 'png'
+            image.convert('RGB').save(output, format='JPEG', quality=85, optimize=True)
+            return output.getvalue(), 'jpg'
+
+    def _store(self, content_hash: str, width: int, thumbnail: bytes, extension: str) -> str:
+        """Write a thumbnail and evict least recently used ones past max_bytes."""
+        name = self._thumbnail_name(content_hash, width, extension)
+        path = os.path.join(self.cache_dir, name)
+        with open(path, 'wb') as f:
+            f.write(thumbnail)
+
+        with self._lock:
+            if name not in self._entries:
+                self._stored[content_hash] += 1
+            self._total_bytes += len(thumbnail) - self._entries.pop(name, 0)
+            self._entries[name] = len(thumbnail)
+            while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+                evicted, size = self._entries.popitem(last=False)
+                self._total_bytes -= size
+                self.stats['evictions'] += 1
+                try:
+                    os.remove(os.path.join(self.cache_dir, evicted))
+                except FileNotFoundError:
+                    pass
+
+                # Drop index entries once no width of the image is left
+                evicted_hash = self._hash_of(evicted)
+                self._stored[evicted_hash] -= 1
+                if self._stored[evicted_hash] <= 0:
+                    del self._stored[evicted_hash]
+                    for url in self._urls.pop(evicted_hash, ()):
+                        del self._index[url]
+        return path
+
+    def _fetch(self, url: str, width: int) -> Optional[str]:
+        """Download, resize and store one image. Runs in the worker pool."""
+        try:
+            with span('image_cache.download'):
+                response = requests.get(url, timeout=self.timeout)
+        except requests.RequestException:
+            response = None
+        if response is None or response.status_code != 200:
+            with self._lock:
+                self.stats['errors'] += 1
+            return None
+
+        data = response.content
+        content_hash = hashlib.sha256(data).hexdigest()
+        with self._lock:
+            self.stats['bytes_downloaded'] += len(data)
+        try:
+            with span('image_cache.resize'):
+                thumbnail, extension = self.resize(data, width)
+        except (OSError, ValueError):  # Not a decodable image
+            with self._lock:
+                self.stats['errors'] += 1
+            return None
+
+        path = self._store(content_hash, width, thumbnail, extension)
+        with self._lock:
+            changed = self._index.get(url) != content_hash
+            # The thumbnail may already have been evicted by a concurrent store
+            if changed and content_hash in self._stored:
+                self._add_url(url, content_hash)
+            else:
+                changed = False
+        if changed:
+            self._save_index()
+        return path
+
+    def _finish(self, key: Tuple[str, int]) -> None:
+        with self._lock:
+            self._pending.pop(key, None)
+
+    def prefetch(self, url: str, width: int) -> Future:
+        """
+        Start caching an image in the background.
+
+        Args:
+            url (str): Remote image URL
+            width (int): Thumbnail width in pixels
+
+        Returns:
+            Future: Resolves to the thumbnail path, or None if the image couldn't be fetched
+        """
+        key = (url, width)
+        with self._lock:
+            pending = self._pending.get(key)
+            if pending is not None:
+                return pending
+
+        path = self._lookup(url, width)
+        if path is not None:
+            future = Future()
+            future.set_result(path)
+            return future
+
+        with self._lock:
+            # Another thread may have started the same fetch meanwhile
+            pending = self._pending.get(key)
+            if pending is None:
+                pending = self._pending[key] = self.executor.submit(self._fetch, url, width)
+                pending.add_done_callback(lambda _: self._finish(key))
+        return pending
+
+    @traced('image_cache.get_thumbnail')
+    def get_thumbnail(self, url: str, width: int, timeout: Optional[float] = None) -> Optional[bytes]:
+        """
+        Get a resized image, downloading it only on the first request.
+
+        Args:
+            url (str): Remote image URL
+            width (int): Thumbnail width in pixels
+            timeout (float, optional): Seconds to wait for a download; None waits for it,
+                0 only returns thumbnails that are already cached
+
+        Returns:
+            Optional[bytes]: Encoded thumbnail, or None if the image couldn't be fetched
+                or isn't ready within timeout (the download carries on in the background)
+        """
+        with self._lock:
+            pending = self._pending.get((url, width))
+        # An in-flight fetch is a miss even if its thumbnail is already stored
+        path = self._lookup(url, width) if pending is None else None
+        if path is not None:
+            with self._lock:
+                self.stats['hits'] += 1
+        else:
+            with self._lock:
+                self.stats['misses'] += 1
+            try:
+                path = self.prefetch(url, width).result(timeout=timeout)
+            except TimeoutError:
+                return None
+            if path is None:
+                return None
+
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:  # Evicted between lookup and read
+            return None
+
+        with self._lock:
+            self.stats['bytes_served'] += len(data)
+        return data
+
+    def metrics(self) -> Dict:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dict: hits, misses, errors, evictions, bytes_downloaded, bytes_served,
+                plus the number and total size of stored thumbnails and
+                the number of indexed URLs
+        """
+        with self._lock:
+            metrics = {key: self.stats[key] for key in
+                       ('hits', 'misses', 'errors', 'evictions', 'bytes_downloaded', 'bytes_served')}
+            metrics['entries'] = len(self._entries)
+            metrics['indexed_urls'] = len(self._index)
+            metrics['stored_bytes'] = self._total_bytes
+        return metrics
@@ -0,0 +1,337 @@
+import os
+import sys
+import json
+import time
+import bisect
+import cProfile
+import threading
+import functools
+from collections import Counter, deque
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+
+# Histogram bucket upper bounds in seconds (Prometheus default buckets)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    def __init__(self, buckets: tuple = DEFAULT_BUCKETS):
+        """
+        Initialize a cumulative latency histogram.
+
+        Args:
+            buckets (tuple): Sorted bucket upper bounds in seconds
+        """
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # Last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        """Record a single duration in seconds."""
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative_counts(self) -> List[int]:
+        """
+        Get cumulative bucket counts, including the +Inf bucket.
+
+        Returns:
+            List[int]: Running totals in bucket order
+        """
+        totals = []
+        running = 0
+        for count in self.counts:
+            running += count
+            totals.append(running)
+        return totals
+
+
+class Tracer:
+    def __init__(self, enabled: bool = False, max_events: int = 10000):
+        """
+        Initialize the tracer.
+
+        Args:
+            enabled (bool): Whether spans are recorded
+            max_events (int): Number of most recent raw span events kept for the trace file
+        """
+        self.enabled = enabled
+        self.max_events = max_events
+        self.histograms: Dict[str, Histogram] = {}
+        self.events: deque = deque(maxlen=max_events)
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+
+    def record(self, name: str, start: float, duration: float) -> None:
+        """
+        Record a finished span.
+
+        Args:
+            name (str): Span name, e.g. 'recommender.music.get_recommendations'
+            start (float): perf_counter() value when the span started
+            duration (float): Span duration in seconds
+        """
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram()
+            histogram.observe(duration)
+
+            # Chrome trace event format (chrome://tracing, Perfetto); oldest events drop off
+            self.events.append({
+                'name': name,
+                'ph': 'X',
+                'ts': (start - self._origin) * 1e6,
+                'dur': duration * 1e6,
+                'pid': os.getpid(),
+                'tid': threading.get_ident()
+            })
+
+    @contextmanager
+    def _active_span(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, start, time.perf_counter() - start)
+
+    def span(self, name: str):
+        """
+        Time a block of code.
+
+        Args:
+            name (str): Span name
+
+        Returns:
+            A context manager; a shared no-op one when tracing is disabled
+        """
+        if not self.enabled:
+            return _NULL_SPAN
+        return self._active_span(name)
+
+    def traced(self, name: str) -> Callable:
+        """
+        Decorator that wraps every call of a function in a span.
+
+        Args:
+            name (str): Span name
+
+        Returns:
+            Callable: Decorator
+        """
+        def decorator(func: Callable) -> Callable:
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.record(name, start, time.perf_counter() - start)
+            return wrapper
+        return decorator
+
+    def reset(self) -> None:
+        """Drop all recorded histograms and events."""
+        with self._lock:
+            self.histograms = {}
+            self.events = deque(maxlen=self.max_events)
+            self._origin = time.perf_counter()
+
+    def summary(self) -> Dict[str, Dict]:
+        """
+        Get per-span count, total and mean duration.
+
+        Returns:
+            Dict[str, Dict]: Statistics keyed by span name
+        """
+        with self._lock:
+            return {
+                name: {
+                    'count': hist.count,
+                    'total_seconds': hist.sum,
+                    'mean_seconds': hist.sum / hist.count if hist.count else 0.0
+                }
+                for name, hist in sorted(self.histograms.items())
+            }
+
+    def export_prometheus(self, metric: str = 'moodboard_span_duration_seconds') -> str:
+        """
+        Render all histograms in the Prometheus text exposition format.
+
+        Args:
+            metric (str): Metric family name
+
+        Returns:
+            str: Exposition text
+        """
+        lines = [
+            f'# HELP {metric} Duration of traced MoodBoard operations.',
+            f'# TYPE {metric} histogram'
+        ]
+        with self._lock:
+            for name, hist in sorted(self.histograms.items()):
+                bounds = [repr(float(b)) for b in hist.buckets] + ['+Inf']
+                for bound, total in zip(bounds, hist.cumulative_counts()):
+                    lines.append(f'{metric}_bucket{{span="{name}",le="{bound}"}} {total}')
+                lines.append(f'{metric}_sum{{span="{name}"}} {hist.sum}')
+                lines.append(f'{metric}_count{{span="{name}"}} {hist.count}')
+        return '\n'.join(lines) + '\n'
+
+    def write_trace(self, path: str) -> None:
+        """
+        Write recorded span events as a JSON trace file.
+
+        The file uses the Chrome trace event format, so it can be opened in
+        chrome://tracing or https://ui.perfetto.dev.
+
+        Args:
+            path (str): Output file path
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            data = {'traceEvents': list(self.events), 'displayTimeUnit': 'ms'}
+        with open(path, 'w') as f:
+            json.dump(data, f)
+
+
+class _NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class SamplingProfiler:
+    def __init__(self, interval: float = 0.01, thread_id: Optional[int] = None):
+        """
+        Initialize a wall-clock stack sampler.
+
+        Stacks are aggregated in the collapsed ("folded") format written by
+        py-spy --format raw, so output can be fed to flamegraph.pl or speedscope.
+
+        Args:
+            interval (float): Seconds between samples
+            thread_id (int, optional): Only sample this thread; all threads if None
+        """
+        self.interval = interval
+        self.thread_id = thread_id
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _sample(self) -> None:
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for tid, frame in sys._current_frames().items():
+                if tid == own_id or (self.thread_id is not None and tid != self.thread_id):
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({code.co_filename}:{frame.f_lineno})")
+                    frame = frame.f_back
+                self.stacks[';'.join(reversed(stack))] += 1
+
+    def start(self) -> None:
+        """Start sampling in a daemon thread."""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop sampling and wait for the sampler thread to exit."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def collapsed(self) -> str:
+        """
+        Get the sampled stacks in collapsed format.
+
+        Returns:
+            str: One 'frame;frame;frame count' line per unique stack
+        """
+        return ''.join(f'{stack} {count}\n' for stack, count in self.stacks.most_common())
+
+    def write(self, path: str) -> None:
+        """Write collapsed stacks to a file."""
+        with open(path, 'w') as f:
+            f.write(self.collapsed())
+
+
+@contextmanager
+def profile(output_path: str, mode: str = 'cprofile', interval: float = 0.01):
+    """
+    Profile a block of code.
+
+    Args:
+        output_path (str): Where to write the profile
+        mode (str): 'cprofile' writes pstats data (snakeviz, pstats);
+            'sampling' writes collapsed stacks (flamegraph.pl, speedscope)
+        interval (float): Sampling interval in seconds for 'sampling' mode
+    """
+    directory = os.path.dirname(output_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    if mode == 'sampling':
+        sampler = SamplingProfiler(interval=interval, thread_id=threading.get_ident())
+        sampler.start()
+        try:
+            yield sampler
+        finally:
+            sampler.stop()
+            sampler.write(output_path)
+    elif mode == 'cprofile':
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield profiler
+        finally:
+            profiler.disable()
+            profiler.dump_stats(output_path)
+    else:
+        raise ValueError(f"Unknown profile mode: {mode}")
+
+
+def profile_from_env(name: str):
+    """
+    Profile a block only when MOODBOARD_PROFILE is set.
+
+    MOODBOARD_PROFILE selects the mode ('cprofile' or 'sampling') and
+    MOODBOARD_PROFILE_DIR the output directory (default: app/data/profiles).
+
+    Args:
+        name (str): Profile name, used as the output file stem
+
+    Returns:
+        A context manager; a shared no-op one when profiling is disabled
+    """
+    mode = os.getenv('MOODBOARD_PROFILE')
+    if not mode:
+        return _NULL_SPAN
+    directory = os.getenv('MOODBOARD_PROFILE_DIR', 'app/data/profiles')
+    extension = 'folded' if mode == 'sampling' else 'prof'
+    stamp = time.strftime('%Y%m%d-%H%M%S')
+    return profile(os.path.join(directory, f'{name}-{stamp}.{extension}'), mode=mode)
+
+
+def _env_flag(name: str) -> bool:
+    return os.getenv(name, '').lower() in ('1', 'true', 'yes', 'on')
+
+
+# Shared tracer, enabled with MOODBOARD_TRACING=1
+tracer = Tracer(enabled=_env_flag('MOODBOARD_TRACING'))
+span = tracer.span
+traced = tracer.traced
@@ -0,0 +1,162 @@
+import os
+import json
+import random
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+EMOTIONS = ['happy', 'sad', 'angry', 'fear', 'surprise', 'disgust', 'neutral']
+
+# Fixed text corpus, a few sentences per emotion and of varying length
+TEXT_CORPUS = [
+    "I'm feeling really happy and excited today!",
+    "Just got the job offer I've been waiting months for, I can't stop smiling.",
+    "What a lovely sunny afternoon with friends.",
+    "I'm feeling very sad and depressed.",
+    "Nobody remembered my birthday this year and it hurts more than I expected.",
+    "I miss my grandmother so much.",
+    "I'm really angry at how they treated me in that meeting.",
+    "The train was cancelled again and nobody told us anything, this is infuriating.",
+    "Stop interrupting me!",
+    "I'm scared about the test results coming back tomorrow.",
+    "Walking home alone at night through that park makes me nervous.",
+    "What if I lose everything?",
+    "Wow, I did not see that coming at all!",
+    "They threw me a surprise party and I had absolutely no idea.",
+    "That's disgusting, who leaves food to rot in the sink for a week?",
+    "The way he spoke about those people made me feel sick.",
+    "Just a normal day, nothing special happened.",
+    "I had lunch, answered some emails and went for a short walk.",
+    "",
+    "Honestly I don't know how I feel. Tired, maybe a bit relieved that the week is over, "
+    "but also worried about everything I still have to do before the deadline next Monday.",
+]
+
+
+def make_face_frames(count: int = 8, size: int = 256, seed: int = 0) -> List:
+    """
+    Generate a deterministic set of synthetic face-like BGR frames.
+
+    Args:
+        count (int): Number of frames
+        size (int): Frame width and height in pixels
+        seed (int): Random seed
+
+    Returns:
+        List[np.ndarray]: Frames in the format the webcam detector expects
+    """
+    import cv2
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    frames = []
+    for _ in range(count):
+        frame = rng.integers(0, 60, (size, size, 3), dtype=np.uint8)
+        center = (size // 2 + int(rng.integers(-10, 10)), size // 2 + int(rng.integers(-10, 10)))
+        axes = (size // 4, size // 3)
+        skin = tuple(int(c) for c in rng.integers(120, 230, 3))
+        cv2.ellipse(frame, center, axes, 0, 0, 360, skin, -1)
+
+        # Eyes and mouth
+        eye_y = center[1] - axes[1] // 3
+        for dx in (-axes[0] // 2, axes[0] // 2):
+            cv2.circle(frame, (center[0] + dx, eye_y), size // 32, (40, 40, 40), -1)
+        mouth_curve = int(rng.integers(-20, 20))
+        cv2.ellipse(frame, (center[0], center[1] + axes[1] // 2), (axes[0] // 2, abs(mouth_curve) + 2),
+                    0, 0 if mouth_curve >= 0 else 180, 180 if mouth_curve >= 0 else 360, (30, 30, 120), 3)
+        frames.append(frame)
+    return frames
+
+
+def load_face_frames(directory: str) -> List:
+    """
+    Load a local face image set.
+
+    Args:
+        directory (str): Folder containing .jpg/.jpeg/.png images
+
+    Returns:
+        List[np.ndarray]: BGR frames, in file name order
+    """
+    import cv2
+
+    frames = []
+    for name in sorted(os.listdir(directory)):
+        if name.lower().endswith(('.jpg', '.jpeg', '.png')):
+            frame = cv2.imread(os.path.join(directory, name), cv2.IMREAD_COLOR)
+            if frame is not None:
+                frames.append(frame)
+    return frames
+
+
+def make_journal_entry(rng: random.Random, timestamp: datetime) -> Dict:
+    """
+    Build a single synthetic journal entry shaped like MoodJournal.add_entry output.
+
+    Args:
+        rng (random.Random): Random source
+        timestamp (datetime): Entry time
+
+    Returns:
+        Dict: Journal entry
+    """
+    emotion = rng.choice(EMOTIONS)
+    return {
+        'timestamp': timestamp.isoformat(),
+        'emotion': emotion,
+        'confidence': round(rng.uniform(0.3, 1.0), 4),
+        'input_text': rng.choice(TEXT_CORPUS) or None,
+        'recommendations': {
+            'music': [{
+                'name': f'Track {i}',
+                'artist': f'Artist {rng.randint(1, 50)}',
+                'preview_url': None,
+                'external_url': f'https://open.spotify.com/track/{i}',
+                'album_image': None
+            } for i in range(5)],
+            'movies': [{
+                'title': f'Movie {i}',
+                'overview': 'A synthetic overview.',
+                'release_date': '2020-01-01',
+                'rating': round(rng.uniform(4, 9), 1),
+                'poster_path': None,
+                'genres': ['Drama'],
+                'runtime': rng.randint(80, 160),
+                'tmdb_url': f'https://www.themoviedb.org/movie/{i}'
+            } for i in range(5)],
+            'quotes': [{
+                'content': 'A synthetic quote.',
+                'author': 'Anonymous',
+                'tags': ['wisdom']
+            } for _ in range(3)]
+        }
+    }
+
+
+def generate_journal(path: str, count: int, seed: int = 0, start: Optional[datetime] = None) -> List[Dict]:
+    """
+    Write a synthetic mood journal file.
+
+    Entries are spread over roughly count / 3 days so daily resampling has work to do.
+
+    Args:
+        path (str): Journal JSON file to write
+        count (int): Number of entries
+        seed (int): Random seed
+        start (datetime, optional): Timestamp of the first entry
+
+    Returns:
+        List[Dict]: The generated entries
+    """
+    rng = random.Random(seed)
+    timestamp = start or datetime(2024, 1, 1, 8, 0)
+    entries = []
+    for _ in range(count):
+        timestamp += timedelta(minutes=rng.randint(60, 900))
+        entries.append(make_journal_entry(rng, timestamp))
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(entries, f, indent=2)
+    return entries
@@ -0,0 +1,67 @@
+import os
+import sys
+import argparse
+import tempfile
+from datetime import datetime
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(BENCH_DIR), 'app'))
+
+import suite  # noqa: F401  (registers the benchmarks)
+from runner import TIMING_SETTINGS, compare, format_comparison, format_results, load, run_all, save, settings_mismatch
+from stub_server import StubServer
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Run the MoodBoard AI benchmark suite.')
+    parser.add_argument('-k', '--only', nargs='*', help='Run benchmarks whose name contains, or group equals, any of these')
+    parser.add_argument('-o', '--output', help='Results JSON path (default: benchmarks/results/<timestamp>.json)')
+    parser.add_argument('--baseline', default=os.path.join(BENCH_DIR, 'baseline.json'),
+                        help='Baseline results to compare against')
+    parser.add_argument('--save-baseline', action='store_true', help='Also store these results as the new baseline')
+    parser.add_argument('--threshold', type=float, default=0.2, help='Allowed relative slowdown before flagging (default: 0.2)')
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds of simulated upstream latency per stub request')
+    parser.add_argument('--faces-dir', help='Folder of face images to use instead of the synthetic frames')
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as workdir, StubServer(latency=args.latency) as stub:
+        context = {'workdir': workdir, 'stub': stub, 'faces_dir': args.faces_dir}
+        settings = {'latency': args.latency, 'faces_dir': args.faces_dir}
+        results = run_all(context, only=args.only, settings=settings)
+        results['stub_requests'] = dict(stub.requests)
+
+    print(format_results(results))
+
+    output = args.output or os.path.join(BENCH_DIR, 'results', f"{datetime.now():%Y%m%d-%H%M%S}.json")
+    save(results, output)
+    print(f'\nResults written to {output}')
+
+    if args.save_baseline:
+        save(results, args.baseline)
+        print(f'Baseline written to {args.baseline}')
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print('No baseline found; run with --save-baseline to create one.')
+        return 0
+
+    baseline = load(args.baseline)
+    mismatch = settings_mismatch(results, baseline)
+    for key, (before, after) in mismatch.items():
+        print(f'Warning: {key} was {before!r} in the baseline, {after!r} now')
+    if any(key in mismatch for key in TIMING_SETTINGS):
+        print('Not comparing: the baseline was recorded with different timing settings. '
+              'Rerun with the same --latency/--faces-dir, or use --save-baseline.')
+        return 2
+
+    rows = compare(results, baseline, threshold=args.threshold)
+    print('\n' + format_comparison(rows))
+    regressions = [row['name'] for row in rows if row['regression']]
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
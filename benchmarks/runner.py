@@ -0,0 +1,229 @@
+import os
+import json
+import time
+import platform
+import statistics
+import subprocess
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from utils.tracing import tracer
+
+# Registered benchmarks, in definition order
+BENCHMARKS: List[Dict] = []
+
+# Run settings that change timings; results recorded under different values aren't comparable
+TIMING_SETTINGS = ('latency', 'faces_dir')
+
+
+def benchmark(name: str, group: str, unit: str = 'calls', repeat: int = 5, warmup: int = 1) -> Callable:
+    """
+    Register a benchmark.
+
+    The decorated function receives the shared fixture context, does its
+    (untimed) setup and returns a (callable, items_per_call) tuple. The
+    callable is what gets timed; items_per_call turns time into throughput.
+    An optional third element is an untimed callable run before every
+    repetition, e.g. to reset files the benchmark modifies.
+    If the callable returns a dict of numbers, their medians across
+    repetitions are reported under 'metrics'.
+
+    Args:
+        name (str): Unique benchmark name
+        group (str): Subsystem, e.g. 'inference' or 'journal'
+        unit (str): What one item is, e.g. 'texts' or 'entries'
+        repeat (int): Timed repetitions
+        warmup (int): Untimed repetitions before timing
+
+    Returns:
+        Callable: Decorator
+    """
+    def decorator(func: Callable) -> Callable:
+        BENCHMARKS.append({
+            'name': name,
+            'group': group,
+            'unit': unit,
+            'repeat': repeat,
+            'warmup': warmup,
+            'func': func
+        })
+        return func
+    return decorator
+
+
+def run_benchmark(spec: Dict, context: Dict) -> Dict:
+    """
+    Set up and time a single benchmark.
+
+    Args:
+        spec (Dict): Registered benchmark
+        context (Dict): Shared fixtures
+
+    Returns:
+        Dict: Timing statistics, or a 'skipped' reason if a dependency is missing
+    """
+    try:
+        target, items, *setup = spec['func'](context)
+    except ImportError as e:
+        return {'group': spec['group'], 'skipped': f'missing dependency: {e.name}'}
+    before_each = setup[0] if setup else (lambda: None)
+
+    for _ in range(spec['warmup']):
+        before_each()
+        target()
+
+    tracer.reset()
+    timings = []
+    extra = {}
+    for _ in range(spec['repeat']):
+        before_each()
+        start = time.perf_counter()
+        output = target()
+        timings.append(time.perf_counter() - start)
+        if isinstance(output, dict):
+            for key, value in output.items():
+                extra.setdefault(key, []).append(value)
+
+    median = statistics.median(timings)
+    result = {
+        'group': spec['group'],
+        'unit': spec['unit'],
+        'items_per_call': items,
+        'repeat': spec['repeat'],
+        'min': min(timings),
+        'median': median,
+        'mean': statistics.mean(timings),
+        'stdev': statistics.stdev(timings) if len(timings) > 1 else 0.0,
+        'throughput': items / median if median else None,
+        'spans': tracer.summary()
+    }
+    if extra:
+        result['metrics'] = {key: statistics.median(values) for key, values in extra.items()}
+    return result
+
+
+def run_all(context: Dict, only: Optional[List[str]] = None, settings: Optional[Dict] = None) -> Dict:
+    """
+    Run every registered benchmark.
+
+    Args:
+        context (Dict): Shared fixtures
+        only (List[str], optional): Substrings; run benchmarks whose name or group matches any
+        settings (Dict, optional): Run settings to record, e.g. {'latency': 0.05, 'faces_dir': None}
+
+    Returns:
+        Dict: Results document with environment metadata and run settings
+    """
+    previous = tracer.enabled
+    tracer.enabled = True
+    results = {}
+    try:
+        for spec in BENCHMARKS:
+            if only and not any(key in spec['name'] or key == spec['group'] for key in only):
+                continue
+            results[spec['name']] = run_benchmark(spec, context)
+    finally:
+        tracer.enabled = previous
+
+    return {
+        'created': datetime.now().isoformat(),
+        'commit': _git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'settings': {**(settings or {}), 'only': only or None},
+        'results': results
+    }
+
+
+def settings_mismatch(current: Dict, baseline: Dict) -> Dict[str, tuple]:
+    """
+    Find run settings that differ between two results documents.
+
+    Args:
+        current (Dict): Results document from run_all
+        baseline (Dict): Previously saved results document
+
+    Returns:
+        Dict[str, tuple]: Setting name -> (baseline value, current value); a baseline
+            saved without settings reports every current setting as differing
+    """
+    current_settings = current.get('settings', {})
+    baseline_settings = baseline.get('settings')
+    if baseline_settings is None:
+        return {key: (None, value) for key, value in current_settings.items()}
+    keys = set(current_settings) | set(baseline_settings)
+    return {
+        key: (baseline_settings.get(key), current_settings.get(key))
+        for key in sorted(keys) if baseline_settings.get(key) != current_settings.get(key)
+    }
+
+
+def compare(current: Dict, baseline: Dict, threshold: float = 0.2) -> List[Dict]:
+    """
+    Compare median timings against a baseline.
+
+    Args:
+        current (Dict): Results document from run_all
+        baseline (Dict): Previously saved results document
+        threshold (float): Allowed relative slowdown, e.g. 0.2 for 20%
+
+    Returns:
+        List[Dict]: One row per benchmark present in both runs, with a 'regression' flag
+    """
+    rows = []
+    for name, result in current['results'].items():
+        base = baseline.get('results', {}).get(name)
+        if not base or 'median' not in result or 'median' not in base:
+            continue
+        ratio = result['median'] / base['median'] if base['median'] else float('inf')
+        rows.append({
+            'name': name,
+            'baseline': base['median'],
+            'current': result['median'],
+            'ratio': ratio,
+            'regression': ratio > 1 + threshold
+        })
+    return rows
+
+
+def save(results: Dict, path: str) -> None:
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(results, f, indent=2)
+
+
+def load(path: str) -> Dict:
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def format_results(results: Dict) -> str:
+    lines = [f"{'benchmark':<40} {'median':>12} {'throughput':>22}"]
+    for name, result in results['results'].items():
+        if 'skipped' in result:
+            lines.append(f"{name:<40} {'skipped':>12}   {result['skipped']}")
+            continue
+        throughput = f"{result['throughput']:.1f} {result['unit']}/s" if result['throughput'] else '-'
+        lines.append(f"{name:<40} {result['median'] * 1000:>9.2f} ms {throughput:>22}")
+    return '\n'.join(lines)
+
+
+def format_comparison(rows: List[Dict]) -> str:
+    lines = [f"{'benchmark':<40} {'baseline':>12} {'current':>12} {'ratio':>7}"]
+    for row in rows:
+        flag = '  REGRESSION' if row['regression'] else ''
+        lines.append(f"{row['name']:<40} {row['baseline'] * 1000:>9.2f} ms {row['current'] * 1000:>9.2f} ms "
+                     f"{row['ratio']:>6.2f}x{flag}")
+    return '\n'.join(lines)
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
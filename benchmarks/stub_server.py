@@ -0,0 +1,177 @@
+import io
+import json
+import time
+import random
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+
+def make_image(seed: int, size: tuple = (500, 750)) -> bytes:
+    """
+    Build a deterministic JPEG roughly the size of a TMDB w500 poster.
+
+    Args:
+        seed (int): Random seed
+        size (tuple): Width and height in pixels
+
+    Returns:
+        bytes: Encoded JPEG
+    """
+    from PIL import Image
+
+    rng = random.Random(seed)
+    small = (size[0] // 4, size[1] // 4)
+    image = Image.frombytes('RGB', small, rng.randbytes(small[0] * small[1] * 3)).resize(size, Image.BICUBIC)
+    output = io.BytesIO()
+    image.save(output, format='JPEG', quality=90)
+    return output.getvalue()
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Canned responses for the Spotify, TMDB and quotable endpoints the recommenders call."""
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, body: bytes, content_type: str, status: int = 200) -> None:
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, data, status: int = 200) -> None:
+        self._send(json.dumps(data).encode(), 'application/json', status)
+
+    def _route(self, method: str) -> None:
+        url = urlparse(self.path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        if url.path.startswith('/3/movie/'):
+            route = '/3/movie/{id}'
+        elif url.path.startswith('/images/'):
+            route = '/images/{id}'
+        else:
+            route = url.path
+        self.server.requests[f'{method} {route}'] += 1
+
+        if self.server.latency:
+            time.sleep(self.server.latency)
+
+        if method == 'POST' and url.path == '/spotify/api/token':
+            self._send_json({'access_token': 'stub-token', 'token_type': 'Bearer', 'expires_in': 3600})
+        elif method == 'GET' and url.path == '/spotify/v1/recommendations':
+            limit = int(query.get('limit', 5))
+            self._send_json({'tracks': [{
+                'name': f'Stub Track {i}',
+                'artists': [{'name': f'Stub Artist {i}'}],
+                'preview_url': None,
+                'external_urls': {'spotify': f'https://open.spotify.com/track/stub{i}'},
+                'album': {'images': [{'url': f'https://i.scdn.co/image/stub{i}'}]}
+            } for i in range(limit)]})
+        elif method == 'GET' and url.path == '/3/discover/movie':
+            self._send_json({'page': 1, 'results': [{'id': 1000 + i} for i in range(20)]})
+        elif method == 'GET' and url.path.startswith('/3/movie/'):
+            movie_id = int(url.path.rsplit('/', 1)[-1])
+            self._send_json({
+                'id': movie_id,
+                'title': f'Stub Movie {movie_id}',
+                'overview': 'A stub overview.',
+                'release_date': '2021-06-01',
+                'vote_average': 7.1,
+                'poster_path': f'/stub{movie_id}.jpg',
+                'genres': [{'id': 18, 'name': 'Drama'}],
+                'runtime': 118
+            })
+        elif method == 'GET' and url.path.startswith('/images/') and url.path.endswith('.jpg'):
+            seed = int(url.path[len('/images/'):-len('.jpg')])
+            images = self.server.images
+            if seed not in images:
+                images[seed] = make_image(seed)
+            self._send(images[seed], 'image/jpeg')
+        elif method == 'GET' and url.path == '/quotes/random':
+            limit = int(query.get('limit', 1))
+            self._send_json([{
+                'content': f'Stub quote {i}.',
+                'author': 'Stub Author',
+                'tags': [query.get('tags', 'wisdom')]
+            } for i in range(limit)])
+        else:
+            self._send_json({'error': 'not found'}, status=404)
+
+    def do_GET(self):
+        self._route('GET')
+
+    def do_POST(self):
+        self._route('POST')
+
+
+class StubServer:
+    def __init__(self, latency: float = 0.0, host: str = '127.0.0.1', port: int = 0):
+        """
+        Initialize a local stand-in for the recommendation APIs.
+
+        Args:
+            latency (float): Seconds to sleep before every response, to emulate upstream round trips
+            host (str): Interface to bind
+            port (int): Port to bind, 0 picks a free one
+        """
+        self.httpd = ThreadingHTTPServer((host, port), StubHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.latency = latency
+        self.httpd.requests = Counter()
+        self.httpd.images = {}
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f'http://{host}:{port}'
+
+    @property
+    def requests(self) -> Counter:
+        """Request counts keyed by 'METHOD /path'."""
+        return self.httpd.requests
+
+    def image_url(self, seed: int) -> str:
+        """URL of a deterministic poster-sized JPEG."""
+        return f'{self.url}/images/{seed}.jpg'
+
+    def configure(self, music=None, movies=None, quotes=None) -> None:
+        """
+        Point recommender instances at this server.
+
+        Args:
+            music (SpotifyRecommender, optional): Music recommender
+            movies (MovieRecommender, optional): Movie recommender
+            quotes (QuoteRecommender, optional): Quote recommender
+        """
+        if music is not None:
+            music.client_id = 'stub-client'
+            music.client_secret = 'stub-secret'
+            music.auth_url = f'{self.url}/spotify/api/token'
+            music.base_url = f'{self.url}/spotify/v1'
+        if movies is not None:
+            movies.api_key = 'stub-key'
+            movies.base_url = f'{self.url}/3'
+        if quotes is not None:
+            quotes.base_url = self.url
+
+    def start(self) -> 'StubServer':
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> 'StubServer':
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
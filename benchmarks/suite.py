@@ -0,0 +1,288 @@
+import os
+import time
+import shutil
+import statistics
+
+from runner import benchmark
+from fixtures import EMOTIONS, TEXT_CORPUS, generate_journal, load_face_frames, make_face_frames
+
+
+# Inference
+
+@benchmark('text_emotion.get_emotion', group='inference', unit='texts')
+def bench_text_emotion(context):
+    from emotion.text_emotion import TextEmotionDetector
+
+    detector = context.setdefault('text_detector', TextEmotionDetector())
+
+    def run():
+        for text in TEXT_CORPUS:
+            detector.get_emotion(text)
+    return run, len(TEXT_CORPUS)
+
+
+@benchmark('webcam_emotion.get_emotion_from_frame', group='inference', unit='frames', repeat=3)
+def bench_webcam_emotion(context):
+    from emotion.webcam_emotion import WebcamEmotionDetector
+
+    detector = WebcamEmotionDetector()
+    frames = load_face_frames(context['faces_dir']) if context.get('faces_dir') else make_face_frames()
+
+    def run():
+        for frame in frames:
+            detector.get_emotion_from_frame(frame)
+    return run, len(frames)
+
+
+# Recommenders (against the local stub server)
+
+@benchmark('recommender.music', group='recommender', unit='emotions')
+def bench_music(context):
+    from recommender.music import SpotifyRecommender
+
+    recommender = SpotifyRecommender()
+    context['stub'].configure(music=recommender)
+
+    def run():
+        for emotion in EMOTIONS:
+            recommender.get_recommendations(emotion)
+    return run, len(EMOTIONS)
+
+
+@benchmark('recommender.movies', group='recommender', unit='emotions')
+def bench_movies(context):
+    from recommender.movies import MovieRecommender
+
+    recommender = MovieRecommender()
+    context['stub'].configure(movies=recommender)
+
+    def run():
+        for emotion in EMOTIONS:
+            recommender.get_recommendations(emotion)
+    return run, len(EMOTIONS)
+
+
+@benchmark('recommender.quotes', group='recommender', unit='emotions')
+def bench_quotes(context):
+    from recommender.quotes import QuoteRecommender
+
+    recommender = QuoteRecommender()
+    context['stub'].configure(quotes=recommender)
+
+    def run():
+        for emotion in EMOTIONS:
+            recommender.get_recommendations(emotion)
+    return run, len(EMOTIONS)
+
+
+@benchmark('recommender.prefetch', group='recommender', unit='emotions')
+def bench_prefetch(context):
+    from recommender.movies import MovieRecommender
+    from recommender.music import SpotifyRecommender
+    from recommender.prefetch import RecommendationPrefetcher
+    from recommender.quotes import QuoteRecommender
+
+    recommenders = {'music': SpotifyRecommender(), 'movies': MovieRecommender(), 'quotes': QuoteRecommender(use_fallback=False)}
+    context['stub'].configure(**recommenders)
+    prefetcher = RecommendationPrefetcher(recommenders)
+    prefetcher.warm()
+
+    def run():
+        for emotion in EMOTIONS:
+            for name in recommenders:
+                prefetcher.get_recommendations(name, emotion)
+    return run, len(EMOTIONS)
+
+
+# End-to-end text flow: today's sequential flow vs the speculative pipeline
+
+class _DirectSource:
+    """Pipeline recommendation source that always goes upstream (no pooling)."""
+
+    def __init__(self, recommenders):
+        self.recommenders = recommenders
+
+    def peek(self, name, emotion):
+        return None
+
+    def iter_recommendations(self, name, emotion, use_pool=False):
+        return self.recommenders[name].iter_recommendations(emotion)
+
+    def record_lookup(self, name, emotion, hit):
+        pass
+
+
+def _text_flow_setup(context):
+    from emotion.text_emotion import TextEmotionDetector
+    from recommender.movies import MovieRecommender
+    from recommender.music import SpotifyRecommender
+    from recommender.quotes import QuoteRecommender
+
+    detector = context.setdefault('text_detector', TextEmotionDetector())
+    recommenders = {'music': SpotifyRecommender(), 'movies': MovieRecommender(), 'quotes': QuoteRecommender()}
+    context['stub'].configure(**recommenders)
+    return detector, recommenders
+
+
+@benchmark('pipeline.sequential', group='pipeline', unit='texts', repeat=3)
+def bench_sequential_flow(context):
+    from recommender.speculative import normalize_emotion
+
+    detector, recommenders = _text_flow_setup(context)
+
+    def run():
+        first = []
+        for text in TEXT_CORPUS:
+            start = time.perf_counter()
+            emotion = normalize_emotion(detector.get_emotion(text)['primary_emotion'])
+            recommenders['music'].get_recommendations(emotion)
+            first.append(time.perf_counter() - start)
+            recommenders['quotes'].get_recommendations(emotion)
+            recommenders['movies'].get_recommendations(emotion)
+        return {'time_to_first_recommendation': statistics.mean(first)}
+    return run, len(TEXT_CORPUS)
+
+
+@benchmark('pipeline.speculative', group='pipeline', unit='texts', repeat=3)
+def bench_speculative_flow(context):
+    from emotion.text_emotion import TextEmotionDetector
+    from recommender.speculative import SpeculativePipeline
+
+    detector, recommenders = _text_flow_setup(context)
+    # max_speculations=0: never reuse a speculation, so every text pays full upstream cost
+    pipeline = SpeculativePipeline(_DirectSource(recommenders), TextEmotionDetector.estimate_emotion,
+                                   max_speculations=0)
+
+    def run():
+        analyses = [pipeline.analyze(text, detector.get_emotion) for text in TEXT_CORPUS]
+        return {
+            'time_to_first_recommendation': statistics.mean(a['time_to_first_recommendation'] for a in analyses),
+            'speculation_hit_rate': sum(a['speculation_hit'] for a in analyses) / len(analyses)
+        }
+    return run, len(TEXT_CORPUS)
+
+
+# Journal
+
+def _journal(context, size):
+    from journal.journal import MoodJournal
+
+    path = os.path.join(context['workdir'], f'journal_{size}.json')
+    generate_journal(path, size, seed=size)
+    return MoodJournal(journal_path=path), path
+
+
+def _journal_benchmarks(size):
+    @benchmark(f'journal.add_entry[{size}]', group='journal', unit='entries')
+    def bench_append(context):
+        journal, path = _journal(context, size)
+        pristine = path + '.orig'
+        shutil.copyfile(path, pristine)
+
+        def reset():
+            # Untimed: every repetition appends to a journal of the same size
+            shutil.copyfile(pristine, path)
+
+        def run():
+            journal.add_entry(emotion='happy', confidence=0.9, input_text=TEXT_CORPUS[0])
+        return run, 1, reset
+
+    @benchmark(f'journal.load_entries[{size}]', group='journal', unit='entries')
+    def bench_load(context):
+        journal, _ = _journal(context, size)
+        return journal.load_entries, size
+
+    @benchmark(f'journal.get_emotion_trends[{size}]', group='journal', unit='entries')
+    def bench_trends(context):
+        journal, _ = _journal(context, size)
+        return journal.get_emotion_trends, size
+
+    @benchmark(f'journal.create_visualization[{size}]', group='visualization', unit='entries', repeat=3)
+    def bench_visualization(context):
+        journal, _ = _journal(context, size)
+        return journal.create_visualization, size
+
+
+for _size in (100, 1000, 10000):
+    _journal_benchmarks(_size)
+
+
+# Image cache (posters at the UI's 200px width)
+
+def _fetch_thumbnails(cache, urls, width=200):
+    for url in urls:
+        cache.prefetch(url, width)
+    return [cache.get_thumbnail(url, width) for url in urls]
+
+
+@benchmark('image_cache.cold', group='images', unit='images', repeat=3)
+def bench_image_cache_cold(context):
+    import tempfile
+    from utils.image_cache import ImageCache
+
+    urls = [context['stub'].image_url(i) for i in range(10)]
+
+    def run():
+        with tempfile.TemporaryDirectory(dir=context['workdir']) as cache_dir:
+            cache = ImageCache(cache_dir=cache_dir)
+            thumbnails = _fetch_thumbnails(cache, urls)
+            metrics = cache.metrics()
+        return {
+            'bytes_downloaded': metrics['bytes_downloaded'],
+            'bytes_served': sum(len(t) for t in thumbnails if t)
+        }
+    return run, len(urls)
+
+
+@benchmark('image_cache.page_cold', group='images', unit='images', repeat=3)
+def bench_image_cache_page_cold(context):
+    """
+    The UI's path on a cold cache: prefetch each image as its item arrives, wait
+    briefly for the thumbnail, otherwise let the browser fetch the original.
+    Timing includes the background downloads; render_seconds is the page alone.
+    """
+    import tempfile
+    from stub_server import make_image
+    from utils.image_cache import RENDER_WAIT_SECONDS, ImageCache
+
+    urls = [context['stub'].image_url(i) for i in range(10)]
+    original_bytes = {url: len(make_image(i)) for i, url in enumerate(urls)}
+
+    def run():
+        with tempfile.TemporaryDirectory(dir=context['workdir']) as cache_dir:
+            cache = ImageCache(cache_dir=cache_dir)
+            start = time.perf_counter()
+            downloads = [cache.prefetch(url, 200) for url in urls]
+            thumbnails = [cache.get_thumbnail(url, 200, timeout=RENDER_WAIT_SECONDS) for url in urls]
+            render_seconds = time.perf_counter() - start
+            for download in downloads:
+                download.result()
+            server_bytes = cache.metrics()['bytes_downloaded']
+
+        browser_bytes = sum(len(t) if t else original_bytes[url] for url, t in zip(urls, thumbnails))
+        return {
+            'render_seconds': render_seconds,
+            'remote_fallbacks': sum(1 for t in thumbnails if not t),
+            'browser_bytes': browser_bytes,
+            'server_bytes': server_bytes,
+            'total_bytes': browser_bytes + server_bytes
+        }
+    return run, len(urls)
+
+
+@benchmark('image_cache.warm', group='images', unit='images')
+def bench_image_cache_warm(context):
+    from utils.image_cache import ImageCache
+
+    urls = [context['stub'].image_url(i) for i in range(10)]
+    cache = ImageCache(cache_dir=os.path.join(context['workdir'], 'image_cache_warm'))
+    _fetch_thumbnails(cache, urls)
+
+    def run():
+        before = cache.metrics()['bytes_downloaded']
+        thumbnails = _fetch_thumbnails(cache, urls)
+        return {
+            'bytes_downloaded': cache.metrics()['bytes_downloaded'] - before,
+            'bytes_served': sum(len(t) for t in thumbnails if t)
+        }
+    return run, len(urls)
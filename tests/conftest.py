@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Import app modules the same way `streamlit run app/app.py` does (e.g. `from emotion.text_emotion import ...`)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'app'))
@@ -1,5 +1,5 @@
 import pytest
-from app.emotion.text_emotion import TextEmotionDetector
+from emotion.text_emotion import TextEmotionDetector
 import numpy as np
 
 def test_text_emotion_detector():
@@ -47,4 +47,16 @@ def test_emotion_categories():
     
     for text in test_texts:
         result = detector.get_emotion(text)
-        assert result['primary_emotion'].lower() in valid_emotions 
\ No newline at end of file
+        assert result['primary_emotion'].lower() in valid_emotions 
+
+
+def test_estimate_emotion():
+    result = TextEmotionDetector.estimate_emotion("What a wonderful, happy day!")
+    assert result['primary_emotion'] == 'happy'
+    assert result['sentiment_score'] > 0
+
+    result = TextEmotionDetector.estimate_emotion("This is terrible and awful.")
+    assert result['primary_emotion'] == 'sad'
+
+    result = TextEmotionDetector.estimate_emotion("")
+    assert result['primary_emotion'] == 'neutral'
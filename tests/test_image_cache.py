@@ -0,0 +1,127 @@
+import io
+import json
+import threading
+import pytest
+from PIL import Image
+from utils import image_cache
+from utils.image_cache import ImageCache
+
+
+def make_jpeg(color, size=(500, 750)):
+    output = io.BytesIO()
+    Image.new('RGB', size, color).save(output, format='JPEG')
+    return output.getvalue()
+
+
+class FakeResponse:
+    def __init__(self, content, status_code=200):
+        self.content = content
+        self.status_code = status_code
+
+
+@pytest.fixture
+def remote(monkeypatch):
+    """Serve fake images by URL and count downloads."""
+    images = {}
+    downloads = []
+
+    def fake_get(url, timeout=None):
+        downloads.append(url)
+        if url not in images:
+            return FakeResponse(b'', status_code=404)
+        return FakeResponse(images[url])
+
+    monkeypatch.setattr(image_cache.requests, 'get', fake_get)
+    return images, downloads
+
+
+def test_downloads_once_and_resizes(tmp_path, remote):
+    images, downloads = remote
+    images['https://img/poster.jpg'] = make_jpeg('red')
+    cache = ImageCache(cache_dir=str(tmp_path))
+
+    first = cache.get_thumbnail('https://img/poster.jpg', 200)
+    second = cache.get_thumbnail('https://img/poster.jpg', 200)
+    assert first == second
+    assert downloads == ['https://img/poster.jpg']
+
+    with Image.open(io.BytesIO(first)) as thumbnail:
+        assert thumbnail.size == (200, 300)
+
+    metrics = cache.metrics()
+    assert metrics['hits'] == 1
+    assert metrics['misses'] == 1
+    assert metrics['bytes_downloaded'] == len(images['https://img/poster.jpg'])
+    assert metrics['bytes_served'] == 2 * len(first)
+
+
+def test_content_addressed_and_persistent(tmp_path, remote):
+    images, downloads = remote
+    images['https://a/1.jpg'] = images['https://b/1.jpg'] = make_jpeg('blue')
+    cache = ImageCache(cache_dir=str(tmp_path))
+    cache.get_thumbnail('https://a/1.jpg', 100)
+    cache.get_thumbnail('https://b/1.jpg', 100)
+    assert cache.metrics()['entries'] == 1
+
+    # A new instance reuses the thumbnails on disk
+    reopened = ImageCache(cache_dir=str(tmp_path))
+    assert reopened.get_thumbnail('https://a/1.jpg', 100) is not None
+    assert len(downloads) == 2
+    assert reopened.metrics()['hits'] == 1
+
+
+def test_lru_eviction(tmp_path, remote):
+    images, _ = remote
+    for i, color in enumerate(['red', 'green', 'blue']):
+        images[f'https://img/{i}.jpg'] = make_jpeg(color)
+
+    size = len(ImageCache.resize(images['https://img/0.jpg'], 100)[0])
+    cache = ImageCache(cache_dir=str(tmp_path), max_bytes=int(size * 2.5))
+    cache.get_thumbnail('https://img/0.jpg', 100)
+    cache.get_thumbnail('https://img/1.jpg', 100)
+    cache.get_thumbnail('https://img/0.jpg', 100)  # 1 is now least recently used
+    cache.get_thumbnail('https://img/2.jpg', 100)
+
+    metrics = cache.metrics()
+    assert metrics['evictions'] == 1
+    assert metrics['stored_bytes'] <= cache.max_bytes
+    assert cache.get_thumbnail('https://img/0.jpg', 100) is not None
+    assert cache.metrics()['hits'] == 2
+
+
+def test_eviction_prunes_index(tmp_path, remote):
+    images, _ = remote
+    for i, color in enumerate(['red', 'green', 'blue', 'white']):
+        images[f'https://img/{i}.jpg'] = make_jpeg(color)
+
+    size = len(ImageCache.resize(images['https://img/0.jpg'], 100)[0])
+    cache = ImageCache(cache_dir=str(tmp_path), max_bytes=int(size * 1.5))
+    for i in range(4):
+        cache.get_thumbnail(f'https://img/{i}.jpg', 100)
+
+    metrics = cache.metrics()
+    assert metrics['indexed_urls'] == metrics['entries'] == 1
+    with open(cache.index_path) as f:
+        assert list(json.load(f)) == ['https://img/3.jpg']
+
+
+def test_timeout_does_not_wait_for_download(tmp_path, monkeypatch):
+    release = threading.Event()
+
+    def slow_get(url, timeout=None):
+        release.wait()
+        return FakeResponse(make_jpeg('red'))
+
+    monkeypatch.setattr(image_cache.requests, 'get', slow_get)
+    cache = ImageCache(cache_dir=str(tmp_path))
+    assert cache.get_thumbnail('https://img/slow.jpg', 100, timeout=0) is None
+
+    release.set()
+    cache.prefetch('https://img/slow.jpg', 100).result()
+    assert cache.get_thumbnail('https://img/slow.jpg', 100, timeout=0) is not None
+
+
+def test_missing_image(tmp_path, remote):
+    cache = ImageCache(cache_dir=str(tmp_path))
+    assert cache.get_thumbnail('https://img/missing.jpg', 100) is None
+    assert cache.metrics()['errors'] == 1
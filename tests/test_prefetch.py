@@ -0,0 +1,174 @@
+import time
+import threading
+import pytest
+import requests
+from recommender import movies, music
+from recommender.prefetch import RecommendationPrefetcher
+from recommender.quotes import QuoteRecommender
+
+
+class FakeRecommender:
+    def __init__(self, fail=False):
+        self.calls = 0
+        self.fail = fail
+        self._lock = threading.Lock()
+
+    def get_recommendations(self, emotion, limit=5):
+        with self._lock:
+            self.calls += 1
+            call = self.calls
+        if self.fail:
+            raise ConnectionError()
+        return [{'emotion': emotion, 'set': call}]
+
+
+def test_warm_fills_every_pool():
+    music = FakeRecommender()
+    prefetcher = RecommendationPrefetcher({'music': music}, emotions=('happy', 'sad'), pool_size=3)
+    prefetcher.warm()
+
+    assert music.calls == 6
+    metrics = prefetcher.metrics()
+    assert metrics['pools']['music:happy']['size'] == 3
+    assert metrics['pools']['music:sad']['size'] == 3
+
+    # Warming again only tops up pools that are short
+    prefetcher.warm()
+    assert music.calls == 6
+
+
+def test_pool_rotation_and_hits():
+    music = FakeRecommender()
+    prefetcher = RecommendationPrefetcher({'music': music}, emotions=('happy',), pool_size=2)
+    prefetcher.warm()
+
+    first = prefetcher.get_recommendations('music', 'Happy')
+    second = prefetcher.get_recommendations('music', 'happy')
+    third = prefetcher.get_recommendations('music', 'happy')
+    assert first != second
+    assert first == third
+    assert music.calls == 2
+
+    metrics = prefetcher.metrics()
+    assert metrics['pool_hits'] == 3
+    assert metrics['upstream_calls_saved'] == 3
+    assert metrics['hit_rate'] == 1.0
+
+
+def test_miss_fetches_and_pools():
+    music = FakeRecommender()
+    prefetcher = RecommendationPrefetcher({'music': music}, emotions=(), pool_size=2)
+
+    result = prefetcher.get_recommendations('music', 'joy')
+    assert result == [{'emotion': 'joy', 'set': 1}]
+    assert prefetcher.get_recommendations('music', 'joy') == result
+    assert music.calls == 1
+    assert prefetcher.metrics()['pool_misses'] == 1
+
+
+def test_refresh_rotates_out_oldest():
+    music = FakeRecommender()
+    prefetcher = RecommendationPrefetcher({'music': music}, emotions=('sad',), pool_size=2)
+    prefetcher.warm()
+    prefetcher.refresh()
+
+    sets = {prefetcher.get_recommendations('music', 'sad')[0]['set'] for _ in range(2)}
+    assert 3 in sets
+    assert len(sets) == 2
+
+
+def test_upstream_errors_are_not_pooled():
+    prefetcher = RecommendationPrefetcher({'movies': FakeRecommender(fail=True)}, emotions=('fear',))
+    prefetcher.warm()
+
+    assert prefetcher.get_recommendations('movies', 'fear') == []
+    metrics = prefetcher.metrics()
+    assert metrics['upstream_errors'] == 4
+    assert metrics['pools'] == {}
+    assert 'moodboard_prefetch_upstream_errors_total 4' in prefetcher.export_prometheus()
+
+
+class FallbackRecommender(FakeRecommender):
+    def get_fallback(self, emotion):
+        return [{'emotion': emotion, 'fallback': True}]
+
+
+def test_fallback_is_served_but_not_pooled():
+    quotes = FallbackRecommender(fail=True)
+    prefetcher = RecommendationPrefetcher({'quotes': quotes}, emotions=('sad',), pool_size=2)
+    prefetcher.warm()
+
+    assert prefetcher.metrics()['pools'] == {}
+    assert prefetcher.get_recommendations('quotes', 'sad') == [{'emotion': 'sad', 'fallback': True}]
+    assert list(prefetcher.iter_recommendations('quotes', 'sad')) == [{'emotion': 'sad', 'fallback': True}]
+
+    metrics = prefetcher.metrics()
+    assert metrics['upstream_errors'] == 4
+    assert metrics['upstream_calls_saved'] == 0
+
+
+def test_quote_recommender_reports_api_failure():
+    # Nothing listens on port 9 (discard) locally, so the request fails fast
+    recommender = QuoteRecommender(use_fallback=False)
+    recommender.base_url = 'http://127.0.0.1:9'
+    with pytest.raises(requests.RequestException):
+        recommender.get_recommendations('sad')
+
+    recommender.use_fallback = True
+    assert recommender.get_recommendations('sad') == recommender.get_fallback('sad')
+
+
+def test_concurrent_spotify_token_fetch(monkeypatch):
+    posts = []
+
+    class TokenResponse:
+        status_code = 200
+
+        def json(self):
+            return {'access_token': 'token', 'expires_in': 3600}
+
+    def fake_post(*args, **kwargs):
+        posts.append(args)
+        time.sleep(0.05)
+        return TokenResponse()
+
+    monkeypatch.setattr(music.requests, 'post', fake_post)
+    recommender = music.SpotifyRecommender()
+    threads = [threading.Thread(target=recommender.get_token) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(posts) == 1
+    assert recommender.token == 'token'
+
+
+def test_pooled_movie_sets_differ(monkeypatch):
+    class FakeResponse:
+        status_code = 200
+
+        def __init__(self, data):
+            self.data = data
+
+        def json(self):
+            return self.data
+
+    def fake_get(url, params=None):
+        if url.endswith('/discover/movie'):
+            return FakeResponse({'results': [{'id': i} for i in range(20)]})
+        movie_id = int(url.rsplit('/', 1)[-1])
+        return FakeResponse({'title': f'Movie {movie_id}', 'overview': '', 'release_date': '',
+                             'vote_average': 7.0, 'poster_path': None, 'genres': [], 'runtime': 90})
+
+    monkeypatch.setattr(movies.requests, 'get', fake_get)
+    recommender = movies.MovieRecommender()
+    recommender.api_key = 'test-key'
+    prefetcher = RecommendationPrefetcher({'movies': recommender}, emotions=('happy',), pool_size=3)
+    prefetcher.warm()
+
+    pooled = [frozenset(movie['title'] for movie in entry['results'])
+              for entry in prefetcher.pools[('movies', 'happy')]]
+    assert len(pooled) == 3
+    assert all(len(titles) == 5 for titles in pooled)
+    assert len(set().union(*pooled)) == 15
@@ -0,0 +1,177 @@
+import time
+import pstats
+import pytest
+from recommender.prefetch import RecommendationPrefetcher
+from recommender.speculative import SpeculativePipeline, normalize_emotion
+
+
+class FakeSource:
+    """Prefetcher stand-in with an always-empty pool."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = []
+
+    def peek(self, name, emotion):
+        return None
+
+    def iter_recommendations(self, name, emotion, use_pool=True):
+        self.calls.append((name, emotion))
+        time.sleep(self.delay)
+        return [{'provider': name, 'emotion': emotion}]
+
+    def record_lookup(self, name, emotion, hit):
+        pass
+
+
+class StreamingSource(FakeSource):
+    """Yields one item right away and the rest after a delay."""
+
+    def iter_recommendations(self, name, emotion, use_pool=True):
+        self.calls.append((name, emotion))
+        yield {'provider': name, 'index': 0}
+        time.sleep(self.delay)
+        yield {'provider': name, 'index': 1}
+
+
+class FakeRecommender:
+    def get_recommendations(self, emotion, limit=5):
+        return [{'emotion': emotion}]
+
+
+def estimate(text):
+    return {'primary_emotion': 'happy' if 'good' in text else 'neutral'}
+
+
+def classify_as(label, delay=0.0):
+    def classify(text):
+        time.sleep(delay)
+        return {'primary_emotion': label, 'confidence': 0.9}
+    return classify
+
+
+def test_normalize_emotion():
+    assert normalize_emotion('Joy') == 'happy'
+    assert normalize_emotion('sadness') == 'sad'
+    assert normalize_emotion('fear') == 'fear'
+
+
+def test_speculation_hit_reuses_results():
+    source = FakeSource()
+    pipeline = SpeculativePipeline(source, estimate)
+
+    analysis = pipeline.analyze('a good day', classify_as('joy'))
+    assert analysis['speculation_hit']
+    assert analysis['category'] == 'happy'
+    assert analysis['recommendations']['music'] == [{'provider': 'music', 'emotion': 'happy'}]
+    assert len(source.calls) == 3
+    assert pipeline.hit_rate() == 1.0
+
+
+def test_speculation_miss_refetches_for_final_label():
+    source = FakeSource()
+    pipeline = SpeculativePipeline(source, estimate)
+
+    analysis = pipeline.analyze('a good day', classify_as('anger'))
+    assert not analysis['speculation_hit']
+    assert analysis['recommendations']['quotes'] == [{'provider': 'quotes', 'emotion': 'angry'}]
+    assert sorted(emotion for _, emotion in source.calls) == ['angry'] * 3 + ['happy'] * 3
+    assert pipeline.hit_rate() == 0.0
+
+
+def test_speculate_reuses_in_flight_work():
+    source = FakeSource()
+    pipeline = SpeculativePipeline(source, estimate)
+
+    pipeline.speculate('a good day')
+    pipeline.speculate('a good day')
+    pipeline.analyze('a good day', classify_as('joy'))
+    assert len(source.calls) == 3
+
+
+def test_fetches_overlap_inference():
+    source = FakeSource(delay=0.1)
+    pipeline = SpeculativePipeline(source, estimate)
+
+    analysis = pipeline.analyze('a good day', classify_as('joy', delay=0.1))
+    # Sequentially this would be 0.1s inference + 3 x 0.1s fetches
+    assert analysis['total_seconds'] < 0.3
+    assert analysis['time_to_first_recommendation'] >= analysis['inference_seconds']
+
+
+def test_inference_does_not_queue_behind_fetches():
+    source = FakeSource(delay=0.3)
+    pipeline = SpeculativePipeline(source, estimate, max_workers=1)
+
+    # Saturate the fetch pool with another text's speculation
+    pipeline.speculate('another good day')
+    analysis = pipeline.analyze('a good day', classify_as('joy'))
+    assert analysis['inference_seconds'] < 0.2
+
+
+def test_neutral_estimate_skips_speculation():
+    source = FakeSource()
+    pipeline = SpeculativePipeline(source, estimate)
+
+    pipeline.speculate('a day')
+    assert source.calls == []
+
+    analysis = pipeline.analyze('a day', classify_as('sadness'))
+    assert not analysis['speculation_hit']
+    assert sorted(emotion for _, emotion in source.calls) == ['sad'] * 3
+    assert pipeline.stats['skipped'] == 1
+    assert pipeline.hit_rate() is None
+
+
+def test_discarded_speculation_is_not_counted_as_prefetch_hits():
+    recommenders = {name: FakeRecommender() for name in ('music', 'movies', 'quotes')}
+    prefetcher = RecommendationPrefetcher(recommenders, emotions=('happy',), pool_size=2)
+    prefetcher.warm()
+    pipeline = SpeculativePipeline(prefetcher, estimate)
+
+    analysis = pipeline.analyze('a good day', classify_as('anger'))
+    assert not analysis['speculation_hit']
+    metrics = prefetcher.metrics()
+    assert metrics['upstream_calls_saved'] == 0
+    assert metrics['pool_misses'] == 3
+
+    analysis = pipeline.analyze('another good day', classify_as('joy'))
+    assert analysis['speculation_hit']
+    assert analysis['recommendations']['music'] == [{'emotion': 'happy'}]
+    assert prefetcher.metrics()['upstream_calls_saved'] == 3
+
+def test_items_stream_before_the_provider_finishes():
+    pipeline = SpeculativePipeline(StreamingSource(delay=0.3), estimate)
+
+    resolved = pipeline.resolve('a good day', classify_as('joy'))
+    start = time.perf_counter()
+    first = next(iter(resolved['streams']['movies']))
+    assert first == {'provider': 'movies', 'index': 0}
+    assert time.perf_counter() - start < 0.2
+
+    # Streams can be replayed in full by another reader
+    assert [item['index'] for item in resolved['streams']['movies']] == [0, 1]
+    analysis = pipeline.analyze('a good day', classify_as('joy'))
+    assert analysis['time_to_first_recommendation'] < 0.2
+
+def busy_classifier(text):
+    deadline = time.perf_counter() + 0.3
+    while time.perf_counter() < deadline:
+        pass
+    return {'primary_emotion': 'joy', 'confidence': 0.9}
+
+
+@pytest.mark.parametrize('mode', ['cprofile', 'sampling'])
+def test_profile_covers_the_inference_thread(tmp_path, monkeypatch, mode):
+    monkeypatch.setenv('MOODBOARD_PROFILE', mode)
+    monkeypatch.setenv('MOODBOARD_PROFILE_DIR', str(tmp_path))
+    pipeline = SpeculativePipeline(FakeSource(), estimate)
+
+    pipeline.resolve('a good day', busy_classifier, profile_name='text_emotion')
+
+    [path] = tmp_path.iterdir()
+    if mode == 'cprofile':
+        functions = {name for _, _, name in pstats.Stats(str(path)).stats}
+        assert 'busy_classifier' in functions
+    else:
+        assert 'busy_classifier' in path.read_text()
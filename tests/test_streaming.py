@@ -0,0 +1,87 @@
+import time
+from recommender.prefetch import RecommendationPrefetcher
+from recommender.streaming import RecommendationBuffer, stream_recommendations
+from utils.tracing import tracer
+
+
+def slow(items, delay):
+    for item in items:
+        time.sleep(delay)
+        yield item
+
+
+def failing():
+    yield {'id': 1}
+    raise ConnectionError()
+
+
+def test_fast_provider_is_not_blocked_by_slow_one():
+    events = list(stream_recommendations({
+        'movies': lambda: slow([{'id': 'm'}], 0.2),
+        'quotes': lambda: [{'id': 'q1'}, {'id': 'q2'}]
+    }))
+
+    assert events[:3] == [('quotes', {'id': 'q1'}), ('quotes', {'id': 'q2'}), ('quotes', None)]
+    assert events[3:] == [('movies', {'id': 'm'}), ('movies', None)]
+
+
+def test_failing_provider_ends_its_stream():
+    events = list(stream_recommendations({'music': failing}))
+    assert events == [('music', {'id': 1}), ('music', None)]
+
+
+
+def test_buffer_replays_and_reports_failures():
+    buffer = RecommendationBuffer()
+    buffer.fill(failing())
+
+    assert buffer.result() == [{'id': 1}]
+    assert isinstance(buffer.error, ConnectionError)
+    events = list(stream_recommendations({'music': lambda: buffer, 'quotes': lambda: RecommendationBuffer([{'id': 2}])}))
+    assert ('music', {'id': 1}) in events
+    assert ('quotes', {'id': 2}) in events
+    assert len(events) == 4
+
+class StreamingRecommender:
+    def __init__(self):
+        self.calls = 0
+
+    def iter_recommendations(self, emotion, limit=5):
+        self.calls += 1
+        for i in range(3):
+            yield {'emotion': emotion, 'index': i}
+
+
+def test_prefetcher_streams_then_pools():
+    recommender = StreamingRecommender()
+    prefetcher = RecommendationPrefetcher({'music': recommender}, emotions=())
+
+    first = list(prefetcher.iter_recommendations('music', 'Happy'))
+    second = list(prefetcher.iter_recommendations('music', 'happy'))
+    assert first == second
+    assert len(first) == 3
+    assert recommender.calls == 1
+
+    metrics = prefetcher.metrics()
+    assert metrics['pool_misses'] == 1
+    assert metrics['pool_hits'] == 1
+    assert metrics['upstream_calls'] == 1
+
+
+def test_failures_and_streams_are_traced(monkeypatch):
+    monkeypatch.setattr(tracer, 'enabled', True)
+    tracer.reset()
+
+    prefetcher = RecommendationPrefetcher({'quotes': StreamingRecommender()}, emotions=())
+    list(stream_recommendations({
+        'music': failing,
+        'quotes': lambda: prefetcher.iter_recommendations('quotes', 'happy')
+    }))
+
+    summary = tracer.summary()
+    assert summary['stream.music.error']['count'] == 1
+    assert summary['stream.quotes']['count'] == 1
+    assert 'stream.quotes.error' not in summary
+    assert summary['recommender.quotes.iter_recommendations']['count'] == 1
+    tracer.reset()
+
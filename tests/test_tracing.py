@@ -0,0 +1,88 @@
+import json
+import pytest
+from utils.tracing import Tracer, profile
+
+
+def test_disabled_tracer_records_nothing():
+    tracer = Tracer(enabled=False)
+
+    @tracer.traced('noop')
+    def add(a, b):
+        return a + b
+
+    assert add(1, 2) == 3
+    with tracer.span('block'):
+        pass
+    assert tracer.summary() == {}
+
+
+def test_spans_are_aggregated():
+    tracer = Tracer(enabled=True)
+
+    @tracer.traced('work')
+    def work():
+        with tracer.span('work.inner'):
+            return 42
+
+    for _ in range(3):
+        assert work() == 42
+
+    summary = tracer.summary()
+    assert summary['work']['count'] == 3
+    assert summary['work.inner']['count'] == 3
+    assert summary['work']['total_seconds'] >= summary['work.inner']['total_seconds']
+
+
+def test_span_recorded_on_exception():
+    tracer = Tracer(enabled=True)
+    with pytest.raises(ValueError):
+        with tracer.span('failing'):
+            raise ValueError()
+    assert tracer.summary()['failing']['count'] == 1
+
+
+def test_prometheus_export():
+    tracer = Tracer(enabled=True)
+    tracer.record('journal.write', 0.0, 0.02)
+    tracer.record('journal.write', 0.0, 3.0)
+
+    text = tracer.export_prometheus()
+    assert '# TYPE moodboard_span_duration_seconds histogram' in text
+    assert 'moodboard_span_duration_seconds_bucket{span="journal.write",le="0.025"} 1' in text
+    assert 'moodboard_span_duration_seconds_bucket{span="journal.write",le="+Inf"} 2' in text
+    assert 'moodboard_span_duration_seconds_count{span="journal.write"} 2' in text
+
+
+def test_write_trace(tmp_path):
+    tracer = Tracer(enabled=True)
+    with tracer.span('recommender.quotes.get_recommendations'):
+        pass
+
+    path = tmp_path / 'trace.json'
+    tracer.write_trace(str(path))
+    events = json.loads(path.read_text())['traceEvents']
+    assert len(events) == 1
+    assert events[0]['name'] == 'recommender.quotes.get_recommendations'
+    assert events[0]['ph'] == 'X'
+
+
+def test_profile_modes(tmp_path):
+    with profile(str(tmp_path / 'run.prof')):
+        sum(range(1000))
+    assert (tmp_path / 'run.prof').stat().st_size > 0
+
+    with profile(str(tmp_path / 'run.folded'), mode='sampling', interval=0.001) as sampler:
+        total = 0
+        for i in range(200000):
+            total += i
+    assert sampler.stacks
+    assert (tmp_path / 'run.folded').read_text().strip()
+
+
+def test_trace_keeps_most_recent_events():
+    tracer = Tracer(enabled=True, max_events=2)
+    for name in ('first', 'second', 'third'):
+        tracer.record(name, 0.0, 0.001)
+
+    assert [event['name'] for event in tracer.events] == ['second', 'third']
+    assert tracer.summary()['first']['count'] == 1